@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+import numpy as np
+
+from src.game.pocket import PocketType
+from src.game.roulette_wheels import TraitorRouletteWheel
+from src.game.traitor_roulette_game import TraitorRouletteGame
+
+ROOT_PATH = os.path.dirname(os.path.realpath(__file__))
+BASELINE_PATH = os.path.join(ROOT_PATH, "benchmark_baseline.json")
+
+
+def benchmark_spin(n: int) -> Tuple[int, Callable]:
+    wheel = TraitorRouletteWheel()
+
+    def run():
+        for _ in range(n):
+            wheel.spin()
+    return n, run
+
+
+def benchmark_play(n: int) -> Tuple[int, Callable]:
+    game = TraitorRouletteGame(68000)
+
+    def run():
+        for _ in range(n):
+            game.reset()
+            while not game.has_game_ended():
+                game.play(2000, PocketType.RED)
+    return n, run
+
+
+def benchmark_get_valid_bet_size(n: int) -> Tuple[int, Callable]:
+    game = TraitorRouletteGame(68000)
+
+    def run():
+        for i in range(n):
+            game.get_valid_bet_size(i % 100)
+    return n, run
+
+
+def benchmark_env_step(n: int) -> Tuple[int, Callable]:
+    from src.game.ml.ml_environment import TraitorRouletteEnv
+    env = TraitorRouletteEnv(68000)
+
+    def run():
+        env.reset()
+        for _ in range(n):
+            _, _, done, _, _ = env.step(np.float32(.5))
+            if done:
+                env.reset()
+    return n, run
+
+
+def benchmark_bruteforce(n: int) -> Tuple[int, Callable]:
+    from bruteforce import play_shard
+
+    def run():
+        play_shard(68000, np.array([5000]), .01, [n], [0], False, 0)
+    return n, run
+
+
+def benchmark_bruteforce_batch(n: int) -> Tuple[int, Callable]:
+    from bruteforce import play_shard
+
+    def run():
+        play_shard(68000, np.array([5000]), .01, [n], [0], True, 0)
+    return n, run
+
+
+def benchmark_evaluation(n: int) -> Tuple[int, Callable]:
+    from stable_baselines3 import SAC
+    from machine_learning_evaluate import play
+    from src.game.ml.ml_environment import create_environment
+
+    # an untrained model costs as much to query as a trained one
+    directory = tempfile.TemporaryDirectory()
+    SAC("MlpPolicy", create_environment(68000), seed=0).save(
+        os.path.join(directory.name, "model.zip"))
+
+    def run():
+        # referencing the directory keeps it from being deleted
+        play(os.path.join(directory.name, "model.zip"), 68000, n)
+    return n, run
+
+
+def benchmark_startup(arguments: list, n: int) -> Tuple[int, Callable]:
+    """
+    Starts a fresh interpreter for every operation,
+    which measures the import time that no warm up can hide.
+    """
+    def run():
+        for _ in range(n):
+            subprocess.run([sys.executable] + arguments, cwd=ROOT_PATH,
+                           stdout=subprocess.DEVNULL, check=True)
+    return n, run
+
+
+def benchmark_justplay_startup(n: int) -> Tuple[int, Callable]:
+    return benchmark_startup(["justplay.py", "--help"], n)
+
+
+def benchmark_bruteforce_worker_startup(n: int) -> Tuple[int, Callable]:
+    # spawned pool workers import the main module before playing their shard
+    return benchmark_startup(["-c", "from bruteforce import play_shard"], n)
+
+
+BENCHMARKS = {
+    "wheel_spin": (benchmark_spin, 1 << 16),
+    "game_play": (benchmark_play, 1 << 14),
+    "get_valid_bet_size": (benchmark_get_valid_bet_size, 1 << 16),
+    "env_step": (benchmark_env_step, 1 << 14),
+    "bruteforce_run": (benchmark_bruteforce, 1 << 14),
+    "bruteforce_batch_run": (benchmark_bruteforce_batch, 1 << 16),
+    "evaluation": (benchmark_evaluation, 1 << 14),
+    "justplay_startup": (benchmark_justplay_startup, 4),
+    "bruteforce_worker_startup": (benchmark_bruteforce_worker_startup, 4),
+}
+
+
+def measure(create_benchmark: Callable, n: int, repeats: int) -> Dict[str, float]:
+    """
+    Runs a benchmark several times and keeps the fastest run,
+    slower runs are caused by noise rather than the code.
+    """
+    operations, run = create_benchmark(n)
+    seconds = min(timed(run) for _ in range(repeats))
+    return {
+        "operations_per_second": operations / seconds,
+        "seconds_per_operation": seconds / operations,
+    }
+
+
+def timed(run: Callable) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     threshold: float) -> Dict[str, float]:
+    """
+    Returns the relative slowdown of all benchmarks
+    that are slower than the baseline by more than the threshold.
+    """
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        slowdown = 1 - result["operations_per_second"] / \
+            baseline[name]["operations_per_second"]
+        if slowdown > threshold:
+            regressions[name] = slowdown
+    return regressions
+
+
+if __name__ == "__main__":
+    default_threshold = .25
+    default_repeats = 3
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the simulation hot paths and startup of Traitor Roulette.')
+    parser.add_argument('--threshold', dest='threshold',
+                        default=default_threshold, type=float,
+                        help=f'set the relative slowdown against the baseline that fails the benchmark, default is {default_threshold}')
+    parser.add_argument('--repeats', dest='repeats',
+                        default=default_repeats, type=int,
+                        help=f'set how often each benchmark is repeated, default is {default_repeats}')
+    parser.add_argument('--only', dest='only', nargs='+',
+                        default=list(BENCHMARKS), choices=list(BENCHMARKS),
+                        help='run only the given benchmarks')
+    parser.add_argument('--save-baseline', dest='save_baseline', action='store_true',
+                        help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only:
+        create_benchmark, n = BENCHMARKS[name]
+        results[name] = measure(create_benchmark, n, args.repeats)
+        print(f"{name}: {results[name]['operations_per_second']:.0f} ops/s, "
+              f"{results[name]['seconds_per_operation'] * 1e6:.3f} us/op")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=4)
+            f.write("\n")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for name, slowdown in regressions.items():
+            print(f"{name} is {slowdown:.0%} slower than the baseline")
+        if len(regressions) > 0:
+            sys.exit(1)
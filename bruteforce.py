@@ -1,63 +1,442 @@
 
 import argparse
-import random
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+from typing import Dict, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
 from tqdm import tqdm
-from src.common import generate_filepath
+from src.common import generate_filepath, get_output_dir_path
+from src.game.bet_sizes import create_bet_size_table
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.exact_evaluation import get_bet_percentage_distribution, get_bet_percentage_surface, get_mean
 from src.game.pocket import PocketType
+from src.game.random_numbers import RandomIntegers, create_generator
 from src.game.roulette_wheels import TraitorRouletteWheel
-from src.game.traitor_roulette_game import TraitorRouletteGame
+from src.game.traitor_roulette_game import BET_SIZE_INCREMENTS, MAX_ROUNDS, TraitorRouletteGame
+from src.profiling import add_profile_arguments, map_profiled, profile
+
+# z-score of a two-sided 95% confidence interval
+Z_95 = 1.96
 
 
 class Run():
+    """
+    Keeps running statistics of the final bankrolls of a bet percentage
+    without storing the bankrolls themselves.
+    """
 
     def __init__(self, percentage: float) -> None:
         self.bet_percentage = percentage
-        self.final_bankrolls = []
+        self.count = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean (Welford)
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
 
     def avg(self):
-        return sum(self.final_bankrolls) / len(self.final_bankrolls)
+        return self.mean
 
     def min(self):
-        return min(self.final_bankrolls)
+        return self.minimum
 
     def max(self):
-        return max(self.final_bankrolls)
+        return self.maximum
+
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def std_error(self):
+        if self.count == 0:
+            return 0.0
+        return math.sqrt(self.variance() / self.count)
 
     def add_final_bankroll(self, bankroll: int):
-        self.final_bankrolls.append(bankroll)
+        self.count += 1
+        delta = bankroll - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (bankroll - self.mean)
+        self.minimum = min(self.minimum, bankroll)
+        self.maximum = max(self.maximum, bankroll)
+
+    def add_final_bankrolls(self, bankrolls: np.ndarray):
+        if len(bankrolls) == 0:
+            return
+        batch_mean = float(np.mean(bankrolls))
+        self._add_statistics(len(bankrolls), batch_mean,
+                             float(np.sum(np.square(bankrolls - batch_mean))),
+                             int(np.min(bankrolls)), int(np.max(bankrolls)))
+
+    def merge(self, other: "Run"):
+        if other.count == 0:
+            return
+        self._add_statistics(other.count, other.mean, other.m2,
+                             other.minimum, other.maximum)
+
+    def _add_statistics(self, count: int, mean: float, m2: float,
+                        minimum: int, maximum: int):
+        # combine other statistics with the running ones (Chan et al.)
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total_count
+        self.m2 += m2 + delta * delta * self.count * count / total_count
+        self.count = total_count
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
 
+    def to_result(self) -> list:
+        return [self.bet_percentage, self.avg(), self.min(), self.max(),
+                self.std_error()]
 
-def play(bankroll: int, games_count: int):
+
+def play(bankroll: int, games_count: int, batch: bool = False,
+         workers: int = 1, seed: int = None, checkpoint: bool = False):
     step_size = 0.01
-    results = []
+    runs_count = round(100 / step_size)
+    # due to rounding you may not exactly land on the number of desired games
+    games_per_run = round(games_count / runs_count)
+    if seed is None:
+        if checkpoint:
+            raise ValueError("Checkpoints require a seed")
+        seed = np.random.SeedSequence().entropy
+
+    runs = [Run(step_size * i) for i in range(1, runs_count + 1)]
+    checkpoint_path = get_checkpoint_path(bankroll, step_size, seed)
+    if checkpoint and os.path.exists(checkpoint_path):
+        load_checkpoint(checkpoint_path, runs)
+
+    # only games missing from the checkpoint are played
+    def on_shard_merged():
+        if checkpoint:
+            save_checkpoint(checkpoint_path, runs)
+
+    play_runs(bankroll, runs, step_size,
+              [max(games_per_run - run.count, 0) for run in runs],
+              batch, workers, seed, on_shard_merged)
+
+    # Convert results to numpy array
+    return np.array([run.to_result() for run in runs])
+
+
+def play_runs(bankroll: int, runs: list, step_size: float, games_counts: list,
+              batch: bool, workers: int, seed: int, on_shard_merged=None):
+    """
+    Plays the given number of additional games for every run
+    and merges them into the statistics of the runs.
+    """
+    # each run draws from its own stream derived from the seed and
+    # the games already played, therefore the results do not depend
+    # on how runs are sharded
+    run_indices = np.array([i for i, games_count in enumerate(games_counts, start=1)
+                            if games_count > 0])
+    shards = [shard for shard in np.array_split(run_indices, workers * 64)
+              if len(shard) > 0]
+    shard_args = [(bankroll, shard, step_size,
+                   [games_counts[i - 1] for i in shard],
+                   [runs[i - 1].count for i in shard], batch, seed)
+                  for shard in shards]
+
+    def merge_shard(shard_runs: list):
+        for shard_run in shard_runs:
+            runs[round(shard_run.bet_percentage / step_size) - 1].merge(shard_run)
+        if on_shard_merged is not None:
+            on_shard_merged()
+
+    if workers == 1:
+        for args in tqdm(shard_args):
+            merge_shard(play_shard(*args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for shard_runs in tqdm(map_profiled(executor, play_shard, *zip(*shard_args)),
+                                   total=len(shard_args)):
+                merge_shard(shard_runs)
+
+
+def play_adaptive(bankroll: int, games_count: int, batch: bool = False,
+                  workers: int = 1, seed: int = None):
+    """
+    Successive halving over the bet percentages.
+    The budget is split evenly across halving rounds, after each round
+    only the better half of the percentages by average keeps being played.
+    Returns the results, the index of the winner and a statement
+    about the confidence in the winner.
+    """
+    step_size = 0.01
+    runs_count = round(100 / step_size)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    runs = [Run(step_size * i) for i in range(1, runs_count + 1)]
+    candidates = np.arange(runs_count)
+    halving_rounds = get_halving_rounds(runs_count)
+    games_per_round = games_count / halving_rounds
+
+    while True:
+        games_counts = [0] * runs_count
+        for candidate in candidates:
+            games_counts[candidate] = max(
+                round(games_per_round / len(candidates)), 1)
+        play_runs(bankroll, runs, step_size, games_counts,
+                  batch, workers, seed)
+
+        if len(candidates) <= 2:
+            break
+        averages = np.array([runs[candidate].avg() for candidate in candidates])
+        best_half = np.argsort(averages)[::-1][:math.ceil(len(candidates) / 2)]
+        candidates = np.sort(candidates[best_half])
+
+    winner, runner_up = sorted([runs[candidate] for candidate in candidates],
+                               key=lambda run: run.avg(), reverse=True)
+    return np.array([run.to_result() for run in runs]), runs.index(winner), \
+        get_confidence_statement(winner, runner_up)
+
+
+def get_halving_rounds(candidates_count: int) -> int:
+    """
+    Returns the number of rounds successive halving plays
+    until at most two candidates are left.
+    """
+    rounds = 1
+    while candidates_count > 2:
+        candidates_count = math.ceil(candidates_count / 2)
+        rounds += 1
+    return rounds
+
+
+def get_confidence_statement(winner: Run, runner_up: Run) -> str:
+    """
+    Describes how likely the winner has the higher average
+    using a normal approximation of the difference of the averages.
+    """
+    difference = winner.avg() - runner_up.avg()
+    std_error = math.sqrt(winner.std_error() ** 2 + runner_up.std_error() ** 2)
+    probability = 1.0 if std_error == 0 else \
+        0.5 * (1 + math.erf(difference / std_error / math.sqrt(2)))
+
+    return f"Bet percentage {winner.bet_percentage} has a higher average than " \
+        f"the runner-up {runner_up.bet_percentage} with a probability of " \
+        f"{probability:.2%}, the difference is {difference} " \
+        f"+/- {Z_95 * std_error} (95% confidence)"
+
+
+def play_shard(bankroll: int, run_indices: np.ndarray, step_size: float,
+               games_counts: list, played_games_counts: list,
+               batch: bool, seed: int) -> list:
+    """
+    Plays all runs of a shard of bet percentages.
+    """
+    # bet sizes per bet percentage and bankroll are looked up instead of computed
+    bet_size_table = create_bet_size_table(bankroll, step_size * run_indices)
+    runs = []
+    for i, games_count, played_games_count, bet_sizes in zip(
+            run_indices, games_counts, played_games_counts, bet_size_table):
+        run = Run(step_size * i)
+        seed_sequence = np.random.SeedSequence(
+            seed, spawn_key=(int(i), played_games_count))
+
+        rng = create_generator(seed_sequence)
+        if batch:
+            play_batch(run, bankroll, games_count, rng, bet_sizes)
+        else:
+            game = TraitorRouletteGame(bankroll, rng=rng)
+            colors = [PocketType.RED, PocketType.BLACK]
+            color_indices = RandomIntegers(rng, len(colors))
+            # lists are faster to index than arrays for single values
+            bet_sizes = bet_sizes.tolist()
+            for _ in range(games_count):
+                game.reset()
+                while not game.has_game_ended():
+                    bet_size = bet_sizes[game.bankroll // BET_SIZE_INCREMENTS]
+
+                    game.play_unchecked(bet_size, colors[color_indices.next()])
+
+                run.add_final_bankroll(game.bankroll)
+
+        runs.append(run)
+
+    return runs
+
+
+def get_checkpoint_path(bankroll: int, step_size: float, seed: int) -> str:
+    """
+    Creates the path of the checkpoint of a simulation.
+    Checkpoints are not dated, so that a later run can find them.
+    """
+    return os.path.join(get_output_dir_path(),
+                        f"bruteforce_checkpoint_{bankroll}_{step_size}_{seed}.npz")
+
 
-    game = TraitorRouletteGame(bankroll)
-    games_per_run = games_count / (100 / step_size)
-    
+def save_checkpoint(file_path: str, runs: list):
+    """
+    Saves the statistics of all runs.
+    Writing to a temporary file first keeps the last checkpoint
+    intact if the simulation dies while saving.
+    """
+    temporary_file_path = f"{file_path}.tmp.npz"
+    np.savez(temporary_file_path,
+             count=[run.count for run in runs],
+             mean=[run.mean for run in runs],
+             m2=[run.m2 for run in runs],
+             minimum=[run.minimum for run in runs],
+             maximum=[run.maximum for run in runs])
+    os.replace(temporary_file_path, file_path)
+
+
+def load_checkpoint(file_path: str, runs: list):
+    # every access of an npz file reads the array again, each is read once
+    with np.load(file_path) as data:
+        counts, means, m2s, minimums, maximums = [
+            data[key].tolist() for key in ["count", "mean", "m2", "minimum", "maximum"]]
+    if len(counts) != len(runs):
+        raise ValueError("Checkpoint does not match the number of runs")
+    for run, count, mean, m2, minimum, maximum in zip(
+            runs, counts, means, m2s, minimums, maximums):
+        run.count = int(count)
+        run.mean = float(mean)
+        run.m2 = float(m2)
+        run.minimum = float(minimum)
+        run.maximum = float(maximum)
+
+
+def play_batch(run: Run, bankroll: int, games_count: int,
+               rng: np.random.Generator = None, bet_sizes: np.ndarray = None):
+    """
+    Plays all games of a run at once using the vectorized game.
+    The bet sizes of the run per bankroll unit are computed if not given.
+    """
+    rng = rng if rng is not None else create_generator()
+    if bet_sizes is None:
+        bet_sizes = create_bet_size_table(bankroll, [run.bet_percentage])[0]
+    game = BatchTraitorRouletteGame(bankroll, games_count, rng)
+    colors = np.array([PocketType.RED.value, PocketType.BLACK.value])
+
+    while not game.have_all_games_ended():
+        game.play(bet_sizes[game.bankrolls // BET_SIZE_INCREMENTS],
+                  rng.choice(colors, size=games_count))
+
+    run.add_final_bankrolls(game.bankrolls)
+
+
+def play_common_random_numbers(bankroll: int, games_count: int,
+                               reference_percentage: float, seed: int = None):
+    """
+    Plays every bet percentage against the same pre-drawn spins and colors.
+    Returns the results and the paired differences of the final bankrolls
+    against the reference percentage as rows of
+    [bet percentage, average difference, standard error of the difference].
+    """
+    step_size = 0.01
+    runs_count = round(100 / step_size)
     # due to rounding you may not exactly land on the number of desired games
-    for i in tqdm(range(1, round((games_count / games_per_run) + 1))):
+    games_per_run = round(games_count / runs_count)
+
+    rng = create_generator(seed)
+    _, pocket_types = TraitorRouletteWheel().spin_many(
+        MAX_ROUNDS * games_per_run, rng)
+    pocket_types = pocket_types.reshape(MAX_ROUNDS, games_per_run)
+    colors = rng.choice([PocketType.RED.value, PocketType.BLACK.value],
+                        size=(MAX_ROUNDS, games_per_run))
+
+    def play_common_games(bet_sizes: np.ndarray) -> np.ndarray:
+        game = BatchTraitorRouletteGame(bankroll, games_per_run)
+        for round_index in range(MAX_ROUNDS):
+            if game.have_all_games_ended():
+                break
+            game.play(bet_sizes[game.bankrolls // BET_SIZE_INCREMENTS],
+                      colors[round_index], pocket_types[round_index])
+        return game.bankrolls
+
+    # bet sizes per bet percentage and bankroll are looked up instead of computed
+    bet_size_table = create_bet_size_table(
+        bankroll, step_size * np.arange(1, runs_count + 1))
+    reference_bankrolls = play_common_games(
+        create_bet_size_table(bankroll, [reference_percentage])[0])
+
+    results = []
+    differences = []
+    for i in tqdm(range(1, runs_count + 1)):
         run = Run(step_size * i)
+        difference = Run(step_size * i)
+        final_bankrolls = play_common_games(bet_size_table[i - 1])
+        run.add_final_bankrolls(final_bankrolls)
+        difference.add_final_bankrolls(final_bankrolls - reference_bankrolls)
 
-        for _ in range(round(games_per_run)):
-            game.reset()
-            while not game.has_game_ended():
-                bet_size = game.get_valid_bet_size(run.bet_percentage)
+        results.append(run.to_result())
+        differences.append([difference.bet_percentage, difference.avg(),
+                            difference.std_error()])
 
-                game.play(bet_size, random.choice(
-                    [PocketType.RED, PocketType.BLACK]))
-            
-            run.add_final_bankroll(game.bankroll)
+    return np.array(results), np.array(differences)
 
-        results.append([run.bet_percentage, run.avg(), run.min(), run.max()])
 
-    # Convert results to numpy array
-    return np.array(results)
+def play_exact(bankroll: int):
+    """
+    Enumerates all outcomes instead of sampling games.
+    Returns the results and the distribution of final bankrolls
+    per bet percentage.
+    """
+    step_size = 0.01
+    results = []
+    distributions = []
+
+    for i in tqdm(range(1, round(100 / step_size) + 1)):
+        bet_percentage = step_size * i
+        distribution = get_bet_percentage_distribution(bankroll, bet_percentage)
+        distributions.append(distribution)
+
+        # there is no sampling error in the exact results
+        results.append([bet_percentage, float(get_mean(distribution)),
+                        min(distribution), max(distribution), 0.0])
 
+    return np.array(results), distributions
 
-def print_results(results: np.ndarray):
-    run_with_best_avg = results[np.argmax(results[:, 1])]
+
+def play_surface(max_bankroll: int, bankroll_step: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Computes the mean, minimum and maximum final bankroll for all
+    initial bankrolls up to the max bankroll and all bet percentages.
+    Returns the results of the max bankroll and the surface.
+    """
+    step_size = 0.01
+    bankrolls = np.arange(bankroll_step, max_bankroll + 1, bankroll_step)
+    bet_percentages = step_size * np.arange(1, round(100 / step_size) + 1)
+    means, minimums, maximums = get_bet_percentage_surface(
+        bankrolls.tolist(), bet_percentages)
+
+    surface = {
+        "bankrolls": bankrolls,
+        "bet_percentages": bet_percentages,
+        "means": means,
+        "minimums": minimums,
+        "maximums": maximums,
+    }
+    # there is no sampling error in the exact results
+    results = np.column_stack([bet_percentages, means[-1], minimums[-1],
+                               maximums[-1], np.zeros(len(bet_percentages))])
+    return results, surface
+
+
+def save_surface(surface: Dict[str, np.ndarray]):
+    np.savez_compressed(generate_filepath("bruteforce_surface.npz"), **surface)
+
+    best_indices = np.argmax(surface["means"], axis=1)
+    file_path = generate_filepath("bruteforce_surface.txt")
+    # Writing results to a file
+    with open(file_path, "w") as f:
+        f.write("Bankroll, Bet percentage with best average, Average final bankroll\n")
+        for bankroll, means, best_index in zip(surface["bankrolls"],
+                                               surface["means"], best_indices):
+            f.write(f"{bankroll}, {surface['bet_percentages'][best_index]}, "
+                    f"{means[best_index]}\n")
+
+
+def print_results(results: np.ndarray, distributions: list = None,
+                  confidence_statement: str = None, best_index: int = None):
+    if best_index is None:
+        best_index = np.argmax(results[:, 1])
+    run_with_best_avg = results[best_index]
 
     file_path = generate_filepath("bruteforce.txt")
     # Writing results to a file
@@ -66,18 +445,76 @@ def print_results(results: np.ndarray):
                 {run_with_best_avg[0]}\n")
         f.write(f"Average final bankroll: \
                 {run_with_best_avg[1]}\n")
+        f.write(f"Standard error of the average: \
+                {run_with_best_avg[4]}\n")
+        f.write(f"95% confidence interval of the average: \
+                {run_with_best_avg[1] - Z_95 * run_with_best_avg[4]} - \
+                {run_with_best_avg[1] + Z_95 * run_with_best_avg[4]}\n")
+        if confidence_statement is not None:
+            f.write(f"{confidence_statement}\n")
+        if distributions is not None:
+            f.write("Distribution of final bankrolls:\n")
+            for bankroll, probability in sorted(distributions[best_index].items()):
+                f.write(f"{bankroll}: {float(probability)}\n")
+
+
+def print_differences(differences: np.ndarray, reference_percentage: float):
+    best_difference = differences[np.argmax(differences[:, 1])]
+
+    file_path = generate_filepath("bruteforce_differences.txt")
+    # Writing paired differences to a file
+    with open(file_path, "w") as f:
+        f.write(f"Reference bet percentage: {reference_percentage}\n")
+        f.write(f"Bet percentage with best average difference: "
+                f"{best_difference[0]}\n")
+        f.write(f"Average difference of the final bankroll: "
+                f"{best_difference[1]} +/- {Z_95 * best_difference[2]} "
+                f"(95% confidence)\n")
+        f.write("Bet percentage, Average difference, Standard error\n")
+        for bet_percentage, average, std_error in differences:
+            f.write(f"{bet_percentage}, {average}, {std_error}\n")
+
+
+def plot_surface(surface: Dict[str, np.ndarray]):
+    import matplotlib.pyplot as plt
+    bankrolls = surface["bankrolls"]
+    bet_percentages = surface["bet_percentages"]
+    # relative to the initial bankroll the rows are comparable
+    returns = surface["means"] / bankrolls[:, np.newaxis]
+
+    plt.figure(figsize=(12, 10))
+    plt.pcolormesh(bet_percentages, bankrolls, returns, shading='nearest')
+    plt.colorbar(label='Average final bankroll / initial bankroll')
+    plt.plot(bet_percentages[np.argmax(returns, axis=1)], bankrolls, 'r.',
+             label='Best bet percentage')
+
+    plt.xlabel('Bet Percentage (%)')
+    plt.ylabel('Initial bankroll (AU$)')
+    plt.title('Average Final Bankroll vs Bet Percentage and Initial Bankroll')
+    plt.legend(loc='lower left')
+    plt.tight_layout()
+
+    plt.savefig(generate_filepath("bruteforce_surface.png"), dpi=600)
+    plt.close()
 
 
 def plot_results(results: np.ndarray):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(12, 10))
 
-    if results.ndim == 2 and results.shape[1] == 4:
+    if results.ndim == 2 and results.shape[1] == 5:
         bet_percentages = results[:, 0]
         avg_bankrolls = results[:, 1]
         min_bankrolls = results[:, 2]
         max_bankrolls = results[:, 3]
+        std_errors = results[:, 4]
 
         plt.plot(bet_percentages, avg_bankrolls, 'b-', label='Average (AU$)')
+        plt.fill_between(bet_percentages,
+                         avg_bankrolls - Z_95 * std_errors,
+                         avg_bankrolls + Z_95 * std_errors,
+                         color='b', alpha=0.25,
+                         label='95% Confidence of Average (AU$)')
         plt.plot(bet_percentages, min_bankrolls, 'r-', label='Minimum (AU$)')
         plt.plot(bet_percentages, max_bankrolls, 'g-', label='Maximum (AU$)')
     else:
@@ -99,6 +536,8 @@ if __name__ == "__main__":
     default_bankroll = 68000
     default_games_count = 1 << 28
     default_step_size = .01
+    default_reference_percentage = 50
+    default_bankroll_step = 2000
 
     wheel = TraitorRouletteWheel()
 
@@ -110,12 +549,59 @@ if __name__ == "__main__":
     parser.add_argument('--bankroll', dest='bankroll',
                         default=default_bankroll, type=int,
                         help=f'set your initial bankroll should be a multiple of 2000, default is {default_bankroll}')
+    parser.add_argument('--batch', dest='batch', action='store_true',
+                        help='simulate all games of a bet percentage at once using numpy')
+    parser.add_argument('--exact', dest='exact', action='store_true',
+                        help='enumerate all outcomes instead of simulating games, ignores the games count')
+    parser.add_argument('--workers', dest='workers', default=1, type=int,
+                        help='set the number of processes simulating games, default is 1')
+    parser.add_argument('--seed', dest='seed', default=None, type=int,
+                        help='set the seed to reproduce a simulation, default is a random seed')
+    parser.add_argument('--checkpoint', dest='checkpoint', action='store_true',
+                        help='save progress to the output folder and resume or extend previous runs with the same seed')
+    parser.add_argument('--adaptive', dest='adaptive', action='store_true',
+                        help='spend more games on the bet percentages with the best averages using successive halving')
+    parser.add_argument('--common-random-numbers', dest='common_random_numbers', action='store_true',
+                        help='play all bet percentages against the same spins and compare them to a reference percentage')
+    parser.add_argument('--surface', dest='surface', action='store_true',
+                        help='enumerate all outcomes for every initial bankroll up to the bankroll, ignores the games count')
+    parser.add_argument('--bankroll-step', dest='bankroll_step',
+                        default=default_bankroll_step, type=int,
+                        help=f'set the distance between the initial bankrolls of the surface, default is {default_bankroll_step}')
+    parser.add_argument('--reference-percentage', dest='reference_percentage',
+                        default=default_reference_percentage, type=float,
+                        help=f'set the bet percentage differences are reported against, default is {default_reference_percentage}')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    if args.bankroll % 2000 != 0:
-        raise ValueError("Bankroll should be a multiple of 2000")
+    with profile("bruteforce", args.profile, args.profile_interval, args.profile_top):
+        if args.bankroll % 2000 != 0:
+            raise ValueError("Bankroll should be a multiple of 2000")
+        if args.workers < 1:
+            raise ValueError("Workers should be at least 1")
+        if args.surface and (args.bankroll_step <= 0 or args.bankroll_step % 2000 != 0 or
+                             args.bankroll % args.bankroll_step != 0):
+            raise ValueError("Bankroll step should be a positive multiple of 2000 dividing the bankroll")
 
-    results = play(args.bankroll, args.games_count)
+        distributions = None
+        confidence_statement = None
+        best_index = None
+        if args.surface:
+            results, surface = play_surface(args.bankroll, args.bankroll_step)
+            save_surface(surface)
+            plot_surface(surface)
+        elif args.exact:
+            results, distributions = play_exact(args.bankroll)
+        elif args.common_random_numbers:
+            results, differences = play_common_random_numbers(
+                args.bankroll, args.games_count, args.reference_percentage, args.seed)
+            print_differences(differences, args.reference_percentage)
+        elif args.adaptive:
+            results, best_index, confidence_statement = play_adaptive(
+                args.bankroll, args.games_count, args.batch, args.workers, args.seed)
+        else:
+            results = play(args.bankroll, args.games_count, args.batch,
+                           args.workers, args.seed, args.checkpoint)
 
-    print_results(results)
-    plot_results(results)
+        print_results(results, distributions, confidence_statement, best_index)
+        plot_results(results)
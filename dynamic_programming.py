@@ -0,0 +1,37 @@
+import argparse
+import numpy as np
+from src.common import generate_filepath
+from src.game.optimal_policy import OptimalPolicy, solve_optimal_policy
+from src.game.traitor_roulette_game import BET_SIZE_INCREMENTS, MAX_ROUNDS
+
+
+def print_results(policy: OptimalPolicy):
+    file_path = generate_filepath("optimal_policy.txt")
+    # Writing results to a file
+    with open(file_path, "w") as f:
+        f.write(f"Expected final bankroll: {policy.expected_value}\n")
+        f.write("Round, Bankroll, Bet size, Expected final bankroll\n")
+        for round_index in range(MAX_ROUNDS):
+            for unit in np.flatnonzero(policy.bets[round_index]):
+                f.write(f"{round_index + 1}, {unit * BET_SIZE_INCREMENTS}, "
+                        f"{policy.bets[round_index, unit]}, "
+                        f"{policy.values[round_index, unit]}\n")
+
+
+if __name__ == "__main__":
+    default_bankroll = 68000
+
+    parser = argparse.ArgumentParser(
+        description='Compute the optimal Traitor Roulette strategy by dynamic programming.')
+    parser.add_argument('--bankroll', dest='bankroll',
+                        default=default_bankroll, type=int,
+                        help=f'set your initial bankroll should be a multiple of 2000, default is {default_bankroll}')
+    args = parser.parse_args()
+
+    if args.bankroll % 2000 != 0:
+        raise ValueError("Bankroll should be a multiple of 2000")
+
+    policy = solve_optimal_policy(args.bankroll)
+
+    policy.save(generate_filepath("optimal_policy.npz"))
+    print_results(policy)
@@ -1,7 +1,10 @@
 
 import argparse
+import os
+import numpy as np
 from src.game.pocket import PocketType
 from src.game.traitor_roulette_game import TraitorRouletteGame
+from src.profiling import add_profile_arguments, profile
 
 
 if __name__ == "__main__":
@@ -9,31 +12,53 @@ if __name__ == "__main__":
     parser.add_argument('--bankroll', dest='bankroll',
                         default=68000, type=int,
                         help='set your initial bankroll, default is 68000')
+    parser.add_argument('--advisor-model', dest='advisor_model',
+                        type=str, default=None,
+                        help='name of a trained model in output folder that suggests bet sizes')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    game = TraitorRouletteGame(args.bankroll)
+    with profile("justplay", args.profile, args.profile_interval, args.profile_top):
+        game = TraitorRouletteGame(args.bankroll)
 
-    while game.has_game_ended() == False:
-        input_color = input('Choose an a color [r: red, b: black]: ')
-        input_color = input_color.lower()
-        if input_color != 'r' and input_color != 'b':
-            print('Invalid color')
-            continue
+        advisor = None
+        if args.advisor_model is not None:
+            # machine learning dependencies are only loaded if an advisor is used
+            from stable_baselines3 import SAC
+            from src.common import get_output_dir_path
+            from src.game.ml.observations import get_round_divisor
+            from src.game.ml.policy_cache import CachedPolicy
+            advisor = CachedPolicy(SAC.load(os.path.join(
+                get_output_dir_path(), args.advisor_model)), game.max_value)
+
+        while game.has_game_ended() == False:
+            if advisor is not None:
+                action, _ = advisor.predict(np.array([
+                    game.current_round / get_round_divisor(game.rules),
+                    game.bankroll / game.max_value
+                ], dtype=np.float32))
+                print(f'The advisor suggests to bet {game.get_valid_bet_size(float(action) * 100)}$')
+
+            input_color = input('Choose an a color [r: red, b: black]: ')
+            input_color = input_color.lower()
+            if input_color != 'r' and input_color != 'b':
+                print('Invalid color')
+                continue
         
-        input_bet = input(f'Choose your bet size [2000$ increments] your bankroll is {str(game.bankroll)}: ')
-        if input_bet.isdigit() == False or int(input_bet) % 2000 != 0:
-            print('Invalid bet')
-            continue
-        if int(input_bet) > game.bankroll:
-            print('Not enough money')
-            continue
-        if int(input_bet) > args.bankroll:
-            print(f'You cannot set more than your initial bankroll of {args.bankroll}')
-            continue
-
-
-        pocket, winnings = game.play(int(input_bet), PocketType.RED if input_color == 'r' else PocketType.BLACK)
-        print(f"Ball landed in {str(pocket)} you get {winnings}$ back. Your new bankroll is {str(game.bankroll)}")
+            input_bet = input(f'Choose your bet size [2000$ increments] your bankroll is {str(game.bankroll)}: ')
+            if input_bet.isdigit() == False or int(input_bet) % 2000 != 0:
+                print('Invalid bet')
+                continue
+            if int(input_bet) > game.bankroll:
+                print('Not enough money')
+                continue
+            if int(input_bet) > args.bankroll:
+                print(f'You cannot set more than your initial bankroll of {args.bankroll}')
+                continue
+
+
+            pocket, winnings = game.play(int(input_bet), PocketType.RED if input_color == 'r' else PocketType.BLACK)
+            print(f"Ball landed in {str(pocket)} you get {winnings}$ back. Your new bankroll is {str(game.bankroll)}")
         
 
-    print(f"The game has ended. You your bankroll is {game.bankroll}$")
\ No newline at end of file
+        print(f"The game has ended. You your bankroll is {game.bankroll}$")
\ No newline at end of file
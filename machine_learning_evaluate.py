@@ -1,77 +1,104 @@
 import argparse
+from fractions import Fraction
 import os
-from typing import Dict, List
-from matplotlib import pyplot as plt
+from typing import Dict, Tuple
 import numpy as np
-from stable_baselines3 import SAC
 from tqdm import tqdm
 
 from src.common import generate_filepath, get_output_dir_path
-from src.game.ml.ml_environment import create_environment, reward_to_bankroll
-
-
-def play(model_path: str, initial_bankroll: int, num_games: int) -> List[Dict]:
-    model = SAC.load(model_path)
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.exact_evaluation import get_mean
+from src.game.ml.game_records import GameRecords, concatenate_game_records, create_game_records, \
+    get_bankroll_histogram, get_final_records, get_records_count, load_game_records, \
+    sample_bankroll_matrix, save_game_records
+from src.game.ml.observations import get_observations
+from src.game.ml.policy_cache import CachedPolicy
+from src.game.ml.policy_evaluation import get_policy_distribution
+from src.game.pocket import PocketType
+from src.game.random_numbers import create_generator
+from src.game.optimal_policy import solve_optimal_policy
+from src.game.traitor_roulette_game import MAX_MULTIPLIER
+from src.profiling import add_profile_arguments, profile
+
+
+def play(model_path: str, initial_bankroll: int, num_games: int,
+         batch_size: int = 1 << 12) -> GameRecords:
+    from stable_baselines3 import SAC
+    # after the first batch most states are served from the cache
+    policy = CachedPolicy(SAC.load(model_path),
+                          initial_bankroll * MAX_MULTIPLIER)
+    rng = create_generator()
+    colors = np.array([PocketType.RED.value, PocketType.BLACK.value])
 
     games = []
-    env = create_environment(initial_bankroll)
-    for _ in tqdm(range(num_games)):
-        max_bankroll = env.unwrapped.envs[0].unwrapped.game.max_value
-        initial_bankroll = env.unwrapped.envs[0].unwrapped.game.initial_bankroll
-        observation = env.reset()
-        done = False
-        game = []
-
-        round = 0
-        game.append({
-            "round": round,
-            "bankroll": initial_bankroll,
-            "bet_size": None
-        })
-
-        while not done:
-            action, _ = model.predict(observation, deterministic=True)
-            observation, reward, done, info = env.step(action)
-
-            # we need to calc the bankroll from the reward as data from
-            # inner game state as such:
-            # env.unwrapped.envs[0].unwrapped.game.<property name>
-            # nor from the observations can be used
-            # as they auto reset on once done becomes true, therefore not allowing
-            # to pull the last state of the environment before done
-            current_bankroll = reward_to_bankroll(
-                reward[0], initial_bankroll, max_bankroll)
-
-            round += 1
-            game.append({
-                "round": round,
-                "bankroll": current_bankroll,
-                "bet_size": action[0]
-            })
-
-        games.append(game)
-
-    return games
-
-
-def plot_betsize(games: List[Dict]) -> None:
-    bet_sizes = {1: [], 2: [], 3: []}
-
-    # Iterate through all games and collect bet sizes per round
-    for game in games:
-        for round_data in game:
-            round_num = round_data["round"]
-            bet_size = round_data["bet_size"]
-            if bet_size is not None:  # Make sure bet size is valid
-                bet_sizes[round_num].append(bet_size)
+    for start in tqdm(range(0, num_games, batch_size)):
+        game = BatchTraitorRouletteGame(
+            initial_bankroll, min(batch_size, num_games - start), rng)
+        observations = np.zeros((game.games_count, 2), dtype=np.float32)
+        rounds = []
+
+        while not game.have_all_games_ended():
+            playing = ~game.has_game_ended()
+            # the policy is queried once per round for the whole batch
+            actions, _ = policy.predict(get_observations(game, observations),
+                                        deterministic=True)
+            actions = np.reshape(actions, game.games_count)
+
+            bet_sizes = game.get_valid_bet_size(actions * 100)
+            game.play(bet_sizes, rng.choice(colors, size=game.games_count))
+
+            # the bankroll is taken directly from the game
+            # as games that have ended are not reset
+            rounds.append((playing, game.bankrolls.copy(), actions))
+
+        playing, bankrolls, bet_fractions = (np.array(values)
+                                             for values in zip(*rounds))
+        games.append(create_game_records(start, initial_bankroll,
+                                         playing, bankrolls, bet_fractions))
+
+    return concatenate_game_records(games)
+
+
+def evaluate_exact(model_path: str, initial_bankroll: int) -> Tuple[Dict[int, Fraction], float]:
+    """
+    Scores the model over the exact outcome probabilities of the wheel.
+    Returns the exact distribution of final bankrolls and the bet fraction
+    of the first round.
+    """
+    from stable_baselines3 import SAC
+    return get_policy_distribution(SAC.load(model_path), initial_bankroll)
+
+
+def print_exact_results(distribution: Dict[int, Fraction], bet_fraction_first_round: float,
+                        initial_bankroll: int):
+    bust_probability = distribution.get(0, 0)
+    max_probability = distribution.get(initial_bankroll * MAX_MULTIPLIER, 0)
+    optimal_policy = solve_optimal_policy(initial_bankroll)
+
+    file_path = generate_filepath("ml_exact.txt")
+    # Writing results to a file
+    with open(file_path, "w") as f:
+        f.write(f"{float(bust_probability) * 100}% of games go bust\n")
+        f.write(
+            f"{float(max_probability) * 100}% of games achieve the maximum bankroll\n")
+        f.write(
+            f"Bet size in the first round: {bet_fraction_first_round}\n")
+        f.write(
+            f"Expected final bankroll: {float(get_mean(distribution))}\n")
+        f.write(
+            f"Optimal expected final bankroll: {optimal_policy.expected_value}\n")
 
+
+def plot_betsize(games: GameRecords) -> None:
+    from matplotlib import pyplot as plt
     # Calculate average and standard deviation for each round
     averages = []
     std_devs = []
     for round_num in range(1, 4):
-        if bet_sizes[round_num]:  # Check if there are any bets for this round
-            averages.append(np.mean(bet_sizes[round_num]))
-            std_devs.append(np.std(bet_sizes[round_num]))
+        bet_sizes = games["bet_fraction"][games["round"] == round_num]
+        if len(bet_sizes) > 0:  # Check if there are any bets for this round
+            averages.append(np.mean(bet_sizes))
+            std_devs.append(np.std(bet_sizes))
         else:
             averages.append(0)  # No bets to average
             std_devs.append(0)  # No bets to calculate std deviation
@@ -114,40 +141,52 @@ def plot_betsize(games: List[Dict]) -> None:
     plt.close()
 
 
-def plot_all_games(games: list):
+def plot_all_games(games: GameRecords, max_bankroll: int,
+                   trajectories_count: int = 64):
+    from matplotlib import pyplot as plt
+    from matplotlib.colors import LogNorm
     # Visualization
-    # Plotting the bankroll over rounds
-    for game in games:
-        rounds = [entry["round"] for entry in game]
-        bankrolls = [entry["bankroll"] for entry in game]
-        plt.plot(rounds, bankrolls)
+    # the density of all games is drawn as one image,
+    # which takes the same time and memory for any number of games
+    histogram = get_bankroll_histogram(games, max_bankroll)
+    rounds_count = histogram.shape[0] - 1
+    bin_size = max_bankroll / (histogram.shape[1] - 1)
+    plt.imshow(np.ma.masked_equal(histogram.T, 0), origin='lower',
+               aspect='auto', cmap='viridis', norm=LogNorm(),
+               extent=(-.5, rounds_count + .5,
+                       -bin_size / 2, max_bankroll + bin_size / 2))
+    plt.colorbar(label='Games')
+
+    # a few example games show how single games move between the bins
+    if trajectories_count > 0:
+        bankrolls = sample_bankroll_matrix(games, trajectories_count)
+        plt.plot(np.arange(bankrolls.shape[1]), bankrolls.T,
+                 color='white', alpha=.25, linewidth=.5)
 
     plt.title('Stack Size Over Game Rounds')
     plt.xlabel('Round #')
     plt.ylabel('Stack Size')
     plt.ylim(bottom=0)  # Assuming bankroll can't be negative
-    plt.xticks(range(0, 4))  # Assuming max 3 rounds
-    plt.xlim(0, 3)
-    plt.grid()
+    plt.xticks(range(0, rounds_count + 1))
+    plt.xlim(-.5, rounds_count + .5)
 
     plt.savefig(generate_filepath("ml_behavior.png"), dpi=600)
+    plt.close()
 
 
-def print_results(games: list, num_games: int, default_bankroll: int):
-    bust_counter = 0
-    max_counter = 0
-    final_bankrolls = [game[-1]["bankroll"] for game in games]
-    bet_sizes_first_round = [game[1]["bet_size"] for game in games]
+def print_results(games: GameRecords, num_games: int, initial_bankroll: int):
+    final_bankrolls = get_final_records(games)["bankroll"]
+    bet_sizes_first_round = games["bet_fraction"][games["round"] == 1]
 
-    bust_counter = sum(
-        1 for final_bankroll in final_bankrolls if final_bankroll == 0)
-    max_counter = sum(
-        1 for final_bankroll in final_bankrolls if final_bankroll == default_bankroll * 3)
+    bust_counter = np.count_nonzero(final_bankrolls == 0)
+    max_counter = np.count_nonzero(final_bankrolls == initial_bankroll * MAX_MULTIPLIER)
     average_final_bankroll = np.mean(final_bankrolls)
 
     bust_percentage = (bust_counter * 100) / num_games
     max_percentage = (max_counter * 100) / num_games
     avg_bet_size_first_round = np.mean(bet_sizes_first_round)
+    # the optimal strategy is the baseline the model is scored against
+    optimal_policy = solve_optimal_policy(initial_bankroll)
 
     file_path = generate_filepath("ml_behavior.txt")
     # Writing results to a file
@@ -157,12 +196,18 @@ def print_results(games: list, num_games: int, default_bankroll: int):
         f.write(
             f"Average bet size in the first round: {avg_bet_size_first_round}\n")
         f.write(f"Average final bankroll: {average_final_bankroll}\n")
+        f.write(
+            f"Optimal expected final bankroll: {optimal_policy.expected_value}\n")
+        f.write(
+            f"Optimal bet size in the first round: {optimal_policy.get_bet_size(1, initial_bankroll) / initial_bankroll}\n")
 
 
 if __name__ == "__main__":
     default_bankroll = 68000
     default_num_games = 1 << 18
     default_model_name = "trained_model.zip"
+    default_batch_size = 1 << 12
+    default_trajectories = 64
 
     parser = argparse.ArgumentParser(
         description='Evaluate a machine learning model of Traitor Roulette.')
@@ -175,13 +220,38 @@ if __name__ == "__main__":
     parser.add_argument('--num-games', dest='num_games',
                         default=default_num_games, type=int,
                         help=f'set the number of simulated games, default is {default_num_games}')
+    parser.add_argument('--games-file', dest='games_file',
+                        type=str, default=None,
+                        help='name of previously evaluated games in output folder, skips the evaluation of the model')
+    parser.add_argument('--exact', dest='exact', action='store_true',
+                        help='score the model over all possible outcomes instead of simulating games')
+    parser.add_argument('--batch-size', dest='batch_size',
+                        default=default_batch_size, type=int,
+                        help=f'set the number of games simulated at once, default is {default_batch_size}')
+    parser.add_argument('--trajectories', dest='trajectories',
+                        default=default_trajectories, type=int,
+                        help=f'set the number of example games drawn over the density plot, default is {default_trajectories}')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    model_path = os.path.join(get_output_dir_path(), args.model_name)
-
-    games = play(model_path, args.bankroll, args.num_games)
-
-    plot_betsize(games)
-
-    print_results(games, args.num_games, default_bankroll)
-    plot_all_games(games)
+    with profile("ml_evaluate", args.profile, args.profile_interval, args.profile_top):
+        if args.exact:
+            distribution, bet_fraction_first_round = evaluate_exact(
+                os.path.join(get_output_dir_path(), args.model_name), args.bankroll)
+            print_exact_results(distribution, bet_fraction_first_round,
+                                args.bankroll)
+        else:
+            if args.games_file is None:
+                model_path = os.path.join(get_output_dir_path(), args.model_name)
+                games = play(model_path, args.bankroll,
+                             args.num_games, args.batch_size)
+                save_game_records(games, generate_filepath("ml_games.npz"))
+            else:
+                games = load_game_records(os.path.join(
+                    get_output_dir_path(), args.games_file))
+
+            plot_betsize(games)
+
+            print_results(games, get_records_count(get_final_records(games)), args.bankroll)
+            plot_all_games(games, args.bankroll * MAX_MULTIPLIER,
+                           args.trajectories)
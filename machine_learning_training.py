@@ -1,72 +1,244 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import json
+import multiprocessing
+import os
+import time
 
-from matplotlib import pyplot as plt
 import numpy as np
 from stable_baselines3 import SAC
+from threadpoolctl import threadpool_limits
+import torch
+from tqdm import tqdm
 
 from src.common import generate_filepath
 from stable_baselines3.common.callbacks import BaseCallback
+from src.game.exact_evaluation import get_mean
+from src.game.ml.loss_history import LossHistory
 from src.game.ml.ml_environment import bankroll_to_reward, create_environment
+from src.game.ml.policy_evaluation import get_policy_distribution
+from src.profiling import add_profile_arguments, map_profiled, profile
 
 
 class BetPercentageCallback(BaseCallback):
     def __init__(self, verbose=0):
         super(BetPercentageCallback, self).__init__(verbose)
-        self.losses = []
+        # critic and actor losses
+        self.losses = LossHistory(2)
+
+    def _on_rollout_start(self) -> None:
+        # losses only change when the model has been trained,
+        # which happens between the rollouts
+        critic_loss = self.model.logger.name_to_value.get(
+            'train/critic_loss', None)
+        actor_loss = self.model.logger.name_to_value.get(
+            'train/actor_loss', None)
+        if critic_loss is not None and actor_loss is not None:
+            self.losses.append(self.n_calls, critic_loss, actor_loss)
 
     def _on_step(self) -> bool:
-        if len(self.model.logger.name_to_value) > 0:
-            critic_loss = self.model.logger.name_to_value.get(
-                'train/critic_loss', None)
-            actor_loss = self.model.logger.name_to_value.get(
-                'train/actor_loss', None)
-            if critic_loss is not None and actor_loss is not None:
-                self.losses.append((self.n_calls, critic_loss, actor_loss))
+        return True
+
+
+class TimingCallback(BaseCallback):
+    """
+    Measures where training time goes.
+    Rollouts are timed as environment stepping, the time between rollouts
+    as gradient updates. The on_step time of the wrapped callback is
+    measured as callback overhead.
+    """
+
+    def __init__(self, callback: BaseCallback = None, verbose=0):
+        super(TimingCallback, self).__init__(verbose)
+        self.callback = callback
+        self.rollout_seconds = 0.0
+        self.train_seconds = 0.0
+        self.callback_seconds = 0.0
+        self.env_steps = 0
+        self.gradient_updates = 0
+        self._rollout_start = None
+        self._rollout_end = None
+        self._rollout_timesteps = 0
+        self._updates_at_rollout_end = 0
+
+    def _init_callback(self) -> None:
+        if self.callback is not None:
+            self.callback.init_callback(self.model)
+
+    def _on_training_start(self) -> None:
+        if self.callback is not None:
+            self.callback.on_training_start(self.locals, self.globals)
+
+    def _on_rollout_start(self) -> None:
+        now = time.perf_counter()
+        self._add_training_since_rollout_end(now)
+        self._rollout_start = now
+        self._rollout_timesteps = self.num_timesteps
+
+        if self.callback is not None:
+            self.callback.on_rollout_start()
+            self.callback_seconds += time.perf_counter() - now
 
-        return super()._on_step()
-
-
-def train(model_file_path: str, initial_bankroll: int, total_timesteps: int):
-    env = create_environment(initial_bankroll)
+    def _on_step(self) -> bool:
+        if self.callback is None:
+            return True
+        start = time.perf_counter()
+        result = self.callback.on_step()
+        self.callback_seconds += time.perf_counter() - start
+        return result
+
+    def _on_rollout_end(self) -> None:
+        if self.callback is not None:
+            start = time.perf_counter()
+            self.callback.on_rollout_end()
+            self.callback_seconds += time.perf_counter() - start
+
+        self._rollout_end = time.perf_counter()
+        self.rollout_seconds += self._rollout_end - self._rollout_start
+        self.env_steps += self.num_timesteps - self._rollout_timesteps
+        self._updates_at_rollout_end = self.model._n_updates
+
+    def _on_training_end(self) -> None:
+        # the model is trained once more after the last rollout
+        self._add_training_since_rollout_end(time.perf_counter())
+        self._rollout_end = None
+        if self.callback is not None:
+            self.callback.on_training_end()
+
+    def _add_training_since_rollout_end(self, now: float) -> None:
+        if self._rollout_end is not None:
+            self.train_seconds += now - self._rollout_end
+            self.gradient_updates += self.model._n_updates - \
+                self._updates_at_rollout_end
+
+    def get_metrics(self) -> dict:
+        return {
+            "env_steps": self.env_steps,
+            "env_steps_per_second": self.env_steps / self.rollout_seconds
+            if self.rollout_seconds > 0 else None,
+            "rollout_seconds": self.rollout_seconds,
+            "gradient_updates": self.gradient_updates,
+            "seconds_per_gradient_update": self.train_seconds / self.gradient_updates
+            if self.gradient_updates > 0 else None,
+            "train_seconds": self.train_seconds,
+            "callback_seconds": self.callback_seconds,
+            "callback_seconds_per_step": self.callback_seconds / self.n_calls
+            if self.n_calls > 0 else None,
+        }
+
+
+def train(model_file_path: str, initial_bankroll: int, total_timesteps: int,
+          n_envs: int = 1, seed: int = None, learning_rate: float = 3e-4,
+          batch_size: int = 256, run_name: str = None, progress_bar: bool = True):
+    env = create_environment(initial_bankroll, n_envs)
     model = SAC(
         "MlpPolicy",
-        env
+        env,
+        seed=seed,
+        learning_rate=learning_rate,
+        batch_size=batch_size
     )
 
     callback = BetPercentageCallback()
+    timing_callback = TimingCallback(callback)
     model.learn(total_timesteps=total_timesteps,
-                callback=callback, progress_bar=True)
+                callback=timing_callback, progress_bar=progress_bar)
 
     model.save(model_file_path)
 
-    plot_losses(callback.losses)
-    plot_actor_losses(callback.losses)
-
-
-def moving_average(data, window_size):
-    """Calculate the moving average of a given data list."""
-    return np.convolve(data, np.ones(window_size)/window_size, mode='valid')
-
-
-def plot_losses(losses: list):
-    window_size = 32
-    steps, critic_losses, actor_losses = zip(*losses)
-
-    critic_avg = moving_average(critic_losses, window_size)
-    actor_avg = moving_average(actor_losses, window_size)
-
-    # Adjust steps for moving average
-    # Align steps with the moving average length
-    steps_avg = steps[window_size - 1:]
+    save_metrics(timing_callback.get_metrics(), run_name)
+
+    plot_losses(callback.losses, run_name)
+    plot_actor_losses(callback.losses, run_name)
+
+    return model
+
+
+def train_sweep_run(initial_bankroll: int, total_timesteps: int, n_envs: int,
+                    seed: int, learning_rate: float, batch_size: int,
+                    threads: int) -> list:
+    """
+    Trains and scores a single model of a sweep.
+    Threads of torch and native libraries are limited, so that
+    concurrent runs do not oversubscribe the cores.
+    """
+    torch.set_num_threads(threads)
+    with threadpool_limits(limits=threads):
+        # generate_filepath drops dots from file names
+        learning_rate_name = f"{learning_rate:g}".replace(".", "p")
+        run_name = f"seed{seed}_lr{learning_rate_name}_batch{batch_size}"
+        model_file_path = generate_filepath(f"ml_model_{run_name}.zip")
+        model = train(model_file_path,
+                      initial_bankroll, total_timesteps, n_envs, seed,
+                      learning_rate, batch_size, run_name, progress_bar=False)
+        distribution, _ = get_policy_distribution(model, initial_bankroll)
+
+    return [run_name, seed, learning_rate, batch_size,
+            float(get_mean(distribution)), float(distribution.get(0, 0)),
+            os.path.basename(model_file_path)]
+
+
+def sweep(initial_bankroll: int, total_timesteps: int, n_envs: int,
+          seeds: list, learning_rates: list, batch_sizes: list, workers: int):
+    """
+    Trains a model for every combination of seed and hyperparameters
+    in a process pool and ranks them by their exact expected final bankroll.
+    """
+    threads = max((os.cpu_count() or 1) // workers, 1)
+    grid = list(itertools.product(seeds, learning_rates, batch_sizes))
+
+    # torch does not support forking once it has been initialized
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        sweep_args = [(initial_bankroll, total_timesteps, n_envs,
+                       seed, learning_rate, batch_size, threads)
+                      for seed, learning_rate, batch_size in grid]
+        results = list(tqdm(map_profiled(executor, train_sweep_run, *zip(*sweep_args)),
+                            total=len(sweep_args)))
+
+    print_sweep_results(results)
+
+
+def print_sweep_results(results: list):
+    results = sorted(results, key=lambda result: result[4], reverse=True)
+
+    file_path = generate_filepath("ml_sweep.txt")
+    # Writing results to a file
+    with open(file_path, "w") as f:
+        f.write("Rank, Run, Seed, Learning rate, Batch size, "
+                "Expected final bankroll, Bust probability, Model\n")
+        for rank, result in enumerate(results, start=1):
+            f.write(f"{rank}, " + ", ".join(str(value) for value in result) + "\n")
+
+
+def save_metrics(metrics: dict, run_name: str = None):
+    base_filename = "ml_training_metrics" if run_name is None \
+        else f"ml_training_metrics_{run_name}"
+    with open(generate_filepath(f"{base_filename}.json"), "w") as f:
+        json.dump(metrics, f, indent=4)
+
+
+def get_loss_plot_filename(base_filename: str, run_name: str = None) -> str:
+    if run_name is None:
+        return f"{base_filename}.png"
+    return f"{base_filename}_{run_name}.png"
+
+
+def plot_losses(losses: LossHistory, run_name: str = None):
+    from matplotlib import pyplot as plt
+    steps = losses.get_steps()
+    critic_steps_avg, critic_avg = losses.get_moving_averages(0)
+    actor_steps_avg, actor_avg = losses.get_moving_averages(1)
 
     plt.figure(figsize=(12, 10))
 
-    plt.plot(steps, critic_losses, 'r-', label='Critic Loss', alpha=0.25)
-    plt.plot(steps, actor_losses, 'b-', label='Actor Loss', alpha=0.25)
+    plt.plot(steps, losses.get_losses(0), 'r-', label='Critic Loss', alpha=0.25)
+    plt.plot(steps, losses.get_losses(1), 'b-', label='Actor Loss', alpha=0.25)
 
-    plt.plot(steps_avg, critic_avg, 'r--',
+    plt.plot(critic_steps_avg, critic_avg, 'r--',
              label='Critic Loss Average', linewidth=2)
-    plt.plot(steps_avg, actor_avg, 'b--',
+    plt.plot(actor_steps_avg, actor_avg, 'b--',
              label='Actor Loss Average', linewidth=2)
 
     plt.xlabel('Steps')
@@ -74,21 +246,18 @@ def plot_losses(losses: list):
     plt.title('SAC Loss Functions with Moving Averages')
     plt.legend()
 
-    plt.savefig(generate_filepath('ml_sac_losses.png'))
-
-def plot_actor_losses(losses: list):
-    window_size = 32
-    steps, _, actor_losses = zip(*losses)
-
-    actor_avg = moving_average(actor_losses, window_size)
+    plt.savefig(generate_filepath(
+        get_loss_plot_filename('ml_sac_losses', run_name)))
+    plt.close()
 
-    # Adjust steps for moving average
-    # Align steps with the moving average length
-    steps_avg = steps[window_size - 1:]
+def plot_actor_losses(losses: LossHistory, run_name: str = None):
+    from matplotlib import pyplot as plt
+    steps_avg, actor_avg = losses.get_moving_averages(1)
 
     plt.figure(figsize=(12, 10))
 
-    plt.plot(steps, actor_losses, 'b-', label='Actor Loss', alpha=0.25)
+    plt.plot(losses.get_steps(), losses.get_losses(1), 'b-',
+             label='Actor Loss', alpha=0.25)
 
     plt.plot(steps_avg, actor_avg, 'b--',
              label='Actor Loss Average', linewidth=2)
@@ -98,11 +267,14 @@ def plot_actor_losses(losses: list):
     plt.title('SAC Loss Functions with Moving Averages')
     plt.legend()
 
-    plt.savefig(generate_filepath('ml_actor_losses.png'))
+    plt.savefig(generate_filepath(
+        get_loss_plot_filename('ml_actor_losses', run_name)))
+    plt.close()
 
 
 
 def plot_reward_function(initial_bankroll: int):
+    from matplotlib import pyplot as plt
     # Generate bankroll values from 0 to 204000
     bankroll_values = np.linspace(0, 204000, 500)
 
@@ -129,6 +301,11 @@ def plot_reward_function(initial_bankroll: int):
 if __name__ == "__main__":
     default_total_timesteps = 1 << 18
     default_bankroll = 68000
+    default_n_envs = 1
+    default_seeds = [0, 1, 2, 3]
+    default_learning_rates = [3e-4]
+    default_batch_sizes = [256]
+    default_workers = 4
 
     parser = argparse.ArgumentParser(
         description='Train a machine learning model on Traitor Roulette.')
@@ -138,9 +315,32 @@ if __name__ == "__main__":
     parser.add_argument('--bankroll', dest='bankroll',
                         default=default_bankroll, type=int,
                         help=f'set your initial bankroll should be a multiple of 2000, default is {default_bankroll}')
+    parser.add_argument('--n-envs', dest='n_envs',
+                        default=default_n_envs, type=int,
+                        help=f'set the number of games played in parallel while collecting experience, default is {default_n_envs}')
+    parser.add_argument('--sweep', dest='sweep', action='store_true',
+                        help='train a model for every combination of seeds, learning rates and batch sizes')
+    parser.add_argument('--seeds', dest='seeds', nargs='+',
+                        default=default_seeds, type=int,
+                        help=f'set the seeds of a sweep, default is {default_seeds}')
+    parser.add_argument('--learning-rates', dest='learning_rates', nargs='+',
+                        default=default_learning_rates, type=float,
+                        help=f'set the learning rates of a sweep, default is {default_learning_rates}')
+    parser.add_argument('--batch-sizes', dest='batch_sizes', nargs='+',
+                        default=default_batch_sizes, type=int,
+                        help=f'set the batch sizes of a sweep, default is {default_batch_sizes}')
+    parser.add_argument('--workers', dest='workers',
+                        default=default_workers, type=int,
+                        help=f'set the number of models trained concurrently in a sweep, default is {default_workers}')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    plot_reward_function(args.bankroll)
+    with profile("ml_training", args.profile, args.profile_interval, args.profile_top):
+        plot_reward_function(args.bankroll)
 
-    train(generate_filepath("ml_model.zip"), initial_bankroll=args.bankroll,
-          total_timesteps=args.total_timesteps)
+        if args.sweep:
+            sweep(args.bankroll, args.total_timesteps, args.n_envs, args.seeds,
+                  args.learning_rates, args.batch_sizes, args.workers)
+        else:
+            train(generate_filepath("ml_model.zip"), initial_bankroll=args.bankroll,
+                  total_timesteps=args.total_timesteps, n_envs=args.n_envs)
@@ -0,0 +1,147 @@
+from typing import Tuple, Union
+import numpy as np
+
+from src.game.bet_sizes import get_valid_bet_sizes
+from src.game.pocket import PocketType
+from src.game.random_numbers import create_generator
+from src.game.roulette_wheels import RouletteWheel, TraitorRouletteWheel
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+
+
+class BatchTraitorRouletteGame():
+    """
+    Vectorized version of TraitorRouletteGame.
+    Holds the state of many independent games as numpy arrays
+    and plays one round of all running games per call.
+    """
+
+    def __init__(self, initial_bankroll: int, games_count: int,
+                 rng: np.random.Generator = None, wheel: RouletteWheel = None,
+                 rules: TraitorRouletteRules = DEFAULT_RULES):
+        self._initial_bankroll = initial_bankroll
+        self._max_bankroll = rules.get_max_bankroll(initial_bankroll)
+        self._games_count = games_count
+        self._rules = rules
+        self._rng = rng if rng is not None else create_generator()
+        self._wheel = wheel if wheel is not None else TraitorRouletteWheel(self._rng, rules)
+        self._bankrolls = np.full(games_count, initial_bankroll, dtype=np.int64)
+        self._rounds = np.ones(games_count, dtype=np.int64)
+
+    @property
+    def bankrolls(self) -> np.ndarray:
+        return self._bankrolls
+
+    @property
+    def initial_bankroll(self) -> int:
+        return self._initial_bankroll
+
+    @property
+    def current_rounds(self) -> np.ndarray:
+        return self._rounds
+
+    @property
+    def max_value(self) -> int:
+        return self._max_bankroll
+
+    @property
+    def games_count(self) -> int:
+        return self._games_count
+
+    @property
+    def rules(self) -> TraitorRouletteRules:
+        return self._rules
+
+    @property
+    def rng(self) -> np.random.Generator:
+        return self._rng
+
+    def set_rng(self, rng: np.random.Generator = None) -> None:
+        """
+        Spins the wheel with another generator, a new unseeded one by default.
+        """
+        self._rng = rng if rng is not None else create_generator()
+
+    def has_game_ended(self) -> np.ndarray:
+        return (self._bankrolls == 0) | \
+            (self._bankrolls >= self._max_bankroll) | \
+            (self._rounds > self._rules.max_rounds)
+
+    def have_all_games_ended(self) -> bool:
+        return bool(np.all(self.has_game_ended()))
+
+    def reset(self, games: np.ndarray = None):
+        '''
+        Resets all games or only the selected ones.
+        Games can be selected by a boolean mask or by indices.
+        '''
+        if games is None:
+            self._bankrolls.fill(self._initial_bankroll)
+            self._rounds.fill(1)
+        else:
+            self._bankrolls[games] = self._initial_bankroll
+            self._rounds[games] = 1
+
+    def play(self, bets: np.ndarray, predictions: np.ndarray,
+             pocket_types: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Plays one round for every game that has not ended yet.
+        Bets and predictions (PocketType values) are given per game,
+        entries of games that have ended are ignored.
+        Optionally the pocket types the ball lands in can be given per game,
+        otherwise the wheel is spun.
+        Returns the pocket types and the winnings per game,
+        games that have already ended get -1 and 0.
+        '''
+        bets = np.broadcast_to(np.asarray(bets, dtype=np.int64),
+                               self._games_count)
+        predictions = np.broadcast_to(np.asarray(predictions),
+                                      self._games_count)
+
+        active = ~self.has_game_ended()
+        active_bets = bets[active]
+        active_bankrolls = self._bankrolls[active]
+        active_predictions = predictions[active]
+
+        if np.any(active_bets > self._initial_bankroll):
+            raise ValueError("Bet must be less than initial bankroll")
+        increments = self._rules.bet_size_increments
+        if np.any((active_bets % increments != 0) &
+                  (active_bankrolls >= increments)):
+            raise ValueError(f"Bet must be a multiple of {increments}")
+        if np.any(active_bets > active_bankrolls):
+            raise ValueError("Bet must be less than bankroll")
+        if np.any((active_predictions != PocketType.RED.value) &
+                  (active_predictions != PocketType.BLACK.value)):
+            raise ValueError("Prediction must be either black or red")
+
+        if pocket_types is None:
+            _, active_pockets = self._wheel.spin_many(
+                len(active_bets), self._rng)
+        else:
+            active_pockets = np.asarray(pocket_types)[active]
+
+        active_bankrolls = active_bankrolls - active_bets
+
+        active_winnings = active_bets * \
+            self._rules.payouts[active_predictions, active_pockets]
+        # cannot win more than the maximum bankroll
+        active_winnings = np.minimum(
+            active_winnings, self._max_bankroll - active_bankrolls)
+
+        self._bankrolls[active] = active_bankrolls + active_winnings
+        self._rounds[active] += 1
+
+        result_pockets = np.full(self._games_count, -1, dtype=np.int8)
+        result_pockets[active] = active_pockets
+        winnings = np.zeros(self._games_count, dtype=np.int64)
+        winnings[active] = active_winnings
+
+        return result_pockets, winnings
+
+    def get_valid_bet_size(self, bet_percentage: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Implements constraints on betting size for all games at once.
+        Return valid bet sizes based on the percentage of the bankroll to bet.
+        """
+        return get_valid_bet_sizes(self._bankrolls, bet_percentage,
+                                   self._initial_bankroll, self._rules)
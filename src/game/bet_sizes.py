@@ -0,0 +1,38 @@
+import numpy as np
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+
+
+def get_valid_bet_sizes(bankrolls: np.ndarray, bet_percentages: np.ndarray,
+                        initial_bankroll: int,
+                        rules: TraitorRouletteRules = DEFAULT_RULES) -> np.ndarray:
+    """
+    Implements the constraints on betting size of TraitorRouletteGame
+    for arrays of bankrolls and bet percentages, which are broadcast
+    against each other.
+    """
+    increments = rules.bet_size_increments
+    bet_sizes = np.asarray(bankrolls) * (np.asarray(bet_percentages) / 100)
+    # np.rint rounds half to even, same as pythons round
+    bet_sizes = np.rint(bet_sizes / increments).astype(np.int64) * increments
+
+    # cannot bet 0
+    bet_sizes[bet_sizes == 0] = increments
+    # cannot bet more than current bankroll
+    bet_sizes = np.minimum(bet_sizes, bankrolls)
+    # cannot bet more than initial bankroll
+    return np.minimum(bet_sizes, initial_bankroll)
+
+
+def create_bet_size_table(initial_bankroll: int, bet_percentages: np.ndarray,
+                          rules: TraitorRouletteRules = DEFAULT_RULES) -> np.ndarray:
+    """
+    Computes TraitorRouletteGame.get_valid_bet_size for every bet percentage
+    and every bankroll a game with the initial bankroll can reach.
+    Returns the bet sizes as a (bet percentages, bankroll units) array,
+    bankrolls are indexed in units of the bet size increments.
+    """
+    increments = rules.bet_size_increments
+    bankrolls = np.arange(rules.get_max_bankroll(initial_bankroll) // increments + 1) \
+        * increments
+    return get_valid_bet_sizes(bankrolls, np.asarray(bet_percentages)[:, np.newaxis],
+                               initial_bankroll, rules)
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from fractions import Fraction
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from src.game.bet_sizes import create_bet_size_table
+from src.game.pocket import Pocket, PocketType
+from src.game.roulette_wheels import RiggedWheel
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+from src.game.traitor_roulette_game import TraitorRouletteGame
+
+# red and black are symmetric, therefore predicting red is sufficient
+PREDICTION = PocketType.RED
+
+
+def get_pocket_probabilities(rules: TraitorRouletteRules = DEFAULT_RULES) -> List[Tuple[Pocket, Fraction]]:
+    """
+    Groups the pockets of the wheel of the rules by type.
+    Returns one representative pocket per type and the exact probability
+    of the ball landing in a pocket of that type.
+    """
+    pockets = rules.pockets
+    counts = defaultdict(int)
+    representatives = {}
+    for pocket in pockets:
+        counts[pocket.type] += 1
+        representatives.setdefault(pocket.type, pocket)
+
+    return [(representatives[pocket_type], Fraction(count, len(pockets)))
+            for pocket_type, count in counts.items()]
+
+
+def play_from_state(initial_bankroll: int, current_round: int, bankroll: int,
+                    bet: int, pocket: Pocket) -> TraitorRouletteGame:
+    """
+    Plays a single round from a given state with a known pocket.
+    Returns the game after the round has been played.
+    """
+    game = create_game_in_state(initial_bankroll, current_round,
+                                bankroll, RiggedWheel([pocket]))
+    game.play(bet, PREDICTION)
+    return game
+
+
+def create_game_in_state(initial_bankroll: int, current_round: int, bankroll: int,
+                         wheel: RiggedWheel = None) -> TraitorRouletteGame:
+    game = TraitorRouletteGame(initial_bankroll, wheel)
+    game._round = current_round
+    game._bankroll = bankroll
+    return game
+
+
+def get_final_bankroll_distribution(initial_bankroll: int,
+                                    get_bet_size: Callable[[TraitorRouletteGame], int]) -> Dict[int, Fraction]:
+    """
+    Enumerates all possible games of a betting strategy.
+    The strategy returns a bet size for a game in a given state.
+    Returns the exact probability of each final bankroll.
+    """
+    pocket_probabilities = get_pocket_probabilities()
+    final_bankrolls = defaultdict(Fraction)
+    current_round = 1
+    states = {initial_bankroll: Fraction(1)}
+
+    while len(states) > 0:
+        next_states = defaultdict(Fraction)
+        for bankroll, probability in states.items():
+            game = create_game_in_state(initial_bankroll, current_round, bankroll)
+            if game.has_game_ended():
+                final_bankrolls[bankroll] += probability
+                continue
+
+            bet = get_bet_size(game)
+            for pocket, pocket_probability in pocket_probabilities:
+                next_bankroll = get_next_bankroll(
+                    initial_bankroll, current_round, bankroll, bet, pocket)
+                next_states[next_bankroll] += probability * pocket_probability
+
+        states = next_states
+        current_round += 1
+
+    return dict(final_bankrolls)
+
+
+def get_bet_percentage_distribution(initial_bankroll: int, bet_percentage: float) -> Dict[int, Fraction]:
+    """
+    Returns the exact probability of each final bankroll
+    when always betting the same percentage of the bankroll.
+    """
+    return get_final_bankroll_distribution(
+        initial_bankroll,
+        lambda game: game.get_valid_bet_size(bet_percentage))
+
+
+def get_bet_percentage_surface(initial_bankrolls: List[int], bet_percentages: np.ndarray,
+                               rules: TraitorRouletteRules = DEFAULT_RULES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the mean, minimum and maximum final bankroll when always
+    betting the same percentage as (initial bankrolls, bet percentages) arrays.
+    The probabilities of all bankrolls are tracked for all percentages at once,
+    the bet sizes are computed once for the largest bankroll and shared
+    by the smaller ones. Probabilities are floats instead of fractions.
+    """
+    increments = rules.bet_size_increments
+    pocket_probabilities = [
+        (rules.get_payout(PREDICTION, pocket.type), float(probability))
+        for pocket, probability in get_pocket_probabilities(rules)]
+    bet_sizes = create_bet_size_table(max(initial_bankrolls), bet_percentages, rules)
+    units = np.arange(bet_sizes.shape[1])
+
+    shape = (len(initial_bankrolls), len(bet_percentages))
+    means, minimums, maximums = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    for i, initial_bankroll in enumerate(initial_bankrolls):
+        initial_units = initial_bankroll // increments
+        cap = rules.get_max_bankroll(initial_bankroll) // increments
+        states = units[:cap + 1]
+        # cannot bet more than the initial bankroll
+        bets = np.minimum(bet_sizes[:, :cap + 1], initial_bankroll) // increments
+        ended = (states == 0) | (states >= cap)
+        rows = np.arange(len(bet_percentages))[:, np.newaxis] * len(states)
+
+        probabilities = np.zeros((len(bet_percentages), len(states)))
+        probabilities[:, initial_units] = 1
+        for _ in range(rules.max_rounds):
+            next_probabilities = np.where(ended, probabilities, 0)
+            playing = np.where(ended, 0, probabilities)
+            for payout, probability in pocket_probabilities:
+                next_states = np.minimum(states + bets * (payout - 1), cap)
+                next_probabilities += np.bincount(
+                    (rows + next_states).ravel(),
+                    weights=(playing * probability).ravel(),
+                    minlength=probabilities.size).reshape(probabilities.shape)
+            probabilities = next_probabilities
+
+        reached = probabilities > 0
+        means[i] = probabilities @ (states * increments)
+        minimums[i] = np.argmax(reached, axis=1) * increments
+        maximums[i] = (len(states) - 1 - np.argmax(reached[:, ::-1], axis=1)) * increments
+
+    return means, minimums, maximums
+
+
+def get_mean(distribution: Dict[int, Fraction]) -> Fraction:
+    return sum(bankroll * probability
+               for bankroll, probability in distribution.items())
+
+
+_next_bankroll_cache = {}
+
+
+def get_next_bankroll(initial_bankroll: int, current_round: int, bankroll: int,
+                       bet: int, pocket: Pocket) -> int:
+    # many bet percentages share the same transitions,
+    # caching avoids replaying them for every percentage
+    key = (initial_bankroll, bankroll, bet, pocket)
+    if key not in _next_bankroll_cache:
+        _next_bankroll_cache[key] = play_from_state(
+            initial_bankroll, current_round, bankroll, bet, pocket).bankroll
+    return _next_bankroll_cache[key]
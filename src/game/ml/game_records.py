@@ -0,0 +1,122 @@
+from typing import Dict, List
+import numpy as np
+
+from src.game.traitor_roulette_game import BET_SIZE_INCREMENTS
+
+# one record per round of a game, round 0 holds the initial bankroll.
+# Records are stored as one array per column, reading a column
+# does not touch the other ones.
+GAME_RECORD_COLUMNS = {
+    "game_id": np.uint32,
+    "round": np.uint8,
+    "bankroll": np.int64,
+    # fraction of the bankroll the policy wanted to bet, nan for round 0
+    "bet_fraction": np.float32,
+}
+
+GameRecords = Dict[str, np.ndarray]
+
+
+def create_game_records(first_game_id: int, initial_bankroll: int,
+                        playing: np.ndarray, bankrolls: np.ndarray,
+                        bet_fractions: np.ndarray) -> GameRecords:
+    """
+    Creates the records of a batch of games.
+    playing, bankrolls and bet_fractions have the shape (rounds, games)
+    and hold whether a game was played in a round, the bankroll
+    after the round and the bet fraction of the round.
+    Returns the records sorted by game id and round.
+    """
+    rounds_count, games_count = bankrolls.shape
+    # transposing orders the records by game and then by round
+    played = np.vstack([np.ones((1, games_count), dtype=bool), playing]).T
+    columns = {
+        "game_id": np.arange(first_game_id, first_game_id + games_count)[:, np.newaxis],
+        "round": np.arange(rounds_count + 1)[np.newaxis, :],
+        "bankroll": np.vstack([np.full((1, games_count), initial_bankroll), bankrolls]).T,
+        "bet_fraction": np.vstack([np.full((1, games_count), np.nan), bet_fractions]).T,
+    }
+    return {name: np.broadcast_to(column, played.shape)[played].astype(GAME_RECORD_COLUMNS[name])
+            for name, column in columns.items()}
+
+
+def select_game_records(records: GameRecords, index) -> GameRecords:
+    """
+    Selects records by a boolean mask, indices or a slice.
+    """
+    return {name: column[index] for name, column in records.items()}
+
+
+def concatenate_game_records(records: List[GameRecords]) -> GameRecords:
+    return {name: np.concatenate([batch[name] for batch in records])
+            for name in GAME_RECORD_COLUMNS}
+
+
+def get_records_count(records: GameRecords) -> int:
+    return len(records["game_id"])
+
+
+def save_game_records(records: GameRecords, file_path: str) -> None:
+    np.savez(file_path, **records)
+
+
+def load_game_records(file_path: str) -> GameRecords:
+    # every access of an npz file reads the column again, each is read once
+    with np.load(file_path) as data:
+        return {name: data[name] for name in GAME_RECORD_COLUMNS}
+
+
+def get_final_records(records: GameRecords) -> GameRecords:
+    """
+    Returns the last record of each game.
+    """
+    game_ids = records["game_id"]
+    is_last = np.append(game_ids[1:] != game_ids[:-1], True)
+    return select_game_records(records, is_last)
+
+
+def get_bankroll_matrix(records: GameRecords, rounds_count: int = 3) -> np.ndarray:
+    """
+    Returns the bankrolls as a (games, rounds + 1) matrix,
+    rounds that were not played are nan.
+    """
+    game_ids = records["game_id"]
+    # records are sorted by game, a new row starts with every game id
+    rows = np.cumsum(np.insert(game_ids[1:] != game_ids[:-1], 0, True)) - 1
+    matrix = np.full((rows[-1] + 1, rounds_count + 1), np.nan)
+    matrix[rows, records["round"]] = records["bankroll"]
+    return matrix
+
+
+def get_bankroll_histogram(records: GameRecords, max_bankroll: int,
+                           bin_size: int = BET_SIZE_INCREMENTS, rounds_count: int = 3,
+                           chunk_size: int = 1 << 20) -> np.ndarray:
+    """
+    Counts the games per round and bankroll bin as a
+    (rounds + 1, bins) matrix, rounds that were not played are not counted.
+    The records are counted in chunks, temporary memory does not grow with the games.
+    """
+    bins_count = max_bankroll // bin_size + 1
+    counts = np.zeros((rounds_count + 1) * bins_count, dtype=np.int64)
+    for start in range(0, get_records_count(records), chunk_size):
+        chunk = select_game_records(records, slice(start, start + chunk_size))
+        bins = np.minimum(chunk["bankroll"] // bin_size, bins_count - 1)
+        counts += np.bincount(chunk["round"].astype(np.int64) * bins_count + bins,
+                              minlength=len(counts))
+    return counts.reshape(rounds_count + 1, bins_count)
+
+
+def sample_bankroll_matrix(records: GameRecords, games_count: int,
+                           rng: np.random.Generator = None,
+                           rounds_count: int = 3) -> np.ndarray:
+    """
+    Returns the bankroll matrix of randomly chosen games.
+    Game ids of the records are expected to be consecutive.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    first_game_id = int(records["game_id"][0])
+    all_games_count = int(records["game_id"][-1]) - first_game_id + 1
+    sampled_ids = first_game_id + rng.choice(
+        all_games_count, size=min(games_count, all_games_count), replace=False)
+    return get_bankroll_matrix(select_game_records(
+        records, np.isin(records["game_id"], sampled_ids)), rounds_count)
@@ -0,0 +1,69 @@
+from collections import deque
+from typing import Tuple
+import numpy as np
+
+
+class LossHistory():
+    """
+    Records losses of a training run in constant memory.
+    Moving averages are updated with every loss, the history keeps
+    every stride-th loss and doubles the stride whenever it is full,
+    which keeps the points spread evenly over the whole run.
+    """
+
+    def __init__(self, series_count: int, window_size: int = 32,
+                 capacity: int = 1 << 12):
+        self.window_size = window_size
+        self.capacity = capacity
+        self.stride = 1
+        self.count = 0
+        self._window = deque(maxlen=window_size)
+        self._window_sum = np.zeros(series_count)
+        # step, the losses and their moving averages per row
+        self._history = np.zeros((capacity, 1 + 2 * series_count))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, step: int, *losses: float) -> None:
+        losses = np.asarray(losses, dtype=np.float64)
+        if len(self._window) == self.window_size:
+            self._window_sum -= self._window[0]
+        self._window.append(losses)
+        self._window_sum += losses
+
+        if self._size == self.capacity and self.count % self.stride == 0:
+            self._downsample()
+        if self.count % self.stride == 0:
+            self._history[self._size] = self._create_row(step, losses)
+            self._size += 1
+        self.count += 1
+
+    def get_steps(self) -> np.ndarray:
+        return self._history[:self._size, 0]
+
+    def get_losses(self, series: int) -> np.ndarray:
+        return self._history[:self._size, 1 + series]
+
+    def get_moving_averages(self, series: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the steps and moving averages of a series,
+        steps before the first full window have no average.
+        """
+        averages = self._history[:self._size, 1 + len(self._window_sum) + series]
+        valid = ~np.isnan(averages)
+        return self.get_steps()[valid], averages[valid]
+
+    def _create_row(self, step: int, losses: np.ndarray) -> np.ndarray:
+        averages = self._window_sum / self.window_size \
+            if len(self._window) == self.window_size \
+            else np.full(len(losses), np.nan)
+        return np.concatenate(([step], losses, averages))
+
+    def _downsample(self) -> None:
+        # every other kept loss is a multiple of the doubled stride
+        kept = self._history[:self._size:2]
+        self._size = len(kept)
+        self._history[:self._size] = kept
+        self.stride *= 2
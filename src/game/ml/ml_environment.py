@@ -1,11 +1,13 @@
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
-import random
 
+from src.game.ml.observations import get_round_divisor
 from src.game.pocket import PocketType
+from src.game.random_numbers import RandomIntegers, create_generator
+from src.game.roulette_wheels import TraitorRouletteWheel
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
 from src.game.traitor_roulette_game import TraitorRouletteGame
-from stable_baselines3.common.env_util import make_vec_env
 
 
 def bankroll_to_reward(bankroll: int, initial_bankroll: int = 68000, max_bankroll: int = 204000) -> float:
@@ -32,38 +34,57 @@ def reward_to_bankroll(reward: float, initial_bankroll: int = 68000, max_bankrol
     return bankroll
 
 
+def create_action_space() -> spaces.Box:
+    # Action space: bet_percentage (.01-1)
+    return spaces.Box(low=0.01, high=1.0, shape=())
+
+
+def create_observation_space() -> spaces.Box:
+    # Observation space: [current_round, bankroll]
+    return spaces.Box(
+        # Minimum values for [current_round, bankroll]
+        low=np.array([1, 0]),
+        # Maximum values for [current_round, bankroll]
+        high=np.array([4, 1]),
+        dtype=np.float32
+    )
+
+
 class TraitorRouletteEnv(gym.Env):
 
-    def __init__(self, initial_bankroll: int):
+    def __init__(self, initial_bankroll: int, rules: TraitorRouletteRules = DEFAULT_RULES,
+                 rng: np.random.Generator = None):
         super().__init__()
-        self.game = TraitorRouletteGame(initial_bankroll)
+        self._wheel = TraitorRouletteWheel(rng, rules)
+        self._colors = [PocketType.RED, PocketType.BLACK]
+        self._color_indices = RandomIntegers(self._wheel.rng, len(self._colors))
+        self.game = TraitorRouletteGame(initial_bankroll, self._wheel, rules)
         self.initial_bankroll = initial_bankroll
         self.max_bet_percentage = 0
 
-        # Action space: bet_percentage (.01-1)
-        self.action_space = spaces.Box(low=0.01, high=1.0, shape=())
-
-        # Observation space: [current_round, bankroll]
-        self.observation_space = spaces.Box(
-            # Minimum values for [current_round, bankroll]
-            low=np.array([1, 0]),
-            # Maximum values for [current_round, bankroll]
-            high=np.array([4, 1]),
-            dtype=np.float32
-        )
+        self.action_space = create_action_space()
+        self.observation_space = create_observation_space()
 
     def reset(self, seed=None):
         super().reset(seed=seed)
+        if seed is not None:
+            # the seed controls the spins and colors of the following games
+            rng = create_generator(seed)
+            self._wheel.set_rng(rng)
+            self._color_indices = RandomIntegers(rng, len(self._colors))
         self.game.reset()
         return self._get_obs(), {}
 
     def step(self, action):
+        if self.game.has_game_ended():
+            raise ValueError("Game has ended")
         bet_percentage = action
 
         bet_size = self.game.get_valid_bet_size(bet_percentage * 100)
-        color = random.choice([PocketType.RED, PocketType.BLACK])
+        color = self._colors[self._color_indices.next()]
 
-        self.game.play(bet_size, color)
+        # valid bet sizes and colors are guaranteed, the remaining checks can be skipped
+        self.game.play_unchecked(bet_size, color)
 
         reward = self._get_reward()
         done = self.game.has_game_ended()
@@ -73,7 +94,7 @@ class TraitorRouletteEnv(gym.Env):
     def _get_obs(self):
         # Observation space: [current_round, bankroll]
         return np.array([
-            self.game.current_round / 4,
+            self.game.current_round / get_round_divisor(self.game.rules),
             self.game.bankroll / self.game.max_value
         ], dtype=np.float32)
 
@@ -82,5 +103,7 @@ class TraitorRouletteEnv(gym.Env):
                                   self.game.max_value)
 
 
-def create_environment(initial_bankroll: int) -> TraitorRouletteEnv:
-    return make_vec_env(lambda: TraitorRouletteEnv(initial_bankroll), n_envs=1)
+def create_environment(initial_bankroll: int, n_envs: int = 1):
+    # imported here as the vectorized environment builds on this module
+    from src.game.ml.vector_environment import TraitorRouletteVecEnv
+    return TraitorRouletteVecEnv(initial_bankroll, n_envs)
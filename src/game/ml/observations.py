@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+
+# kept free of gymnasium and stable_baselines3 so that the models
+# can be queried without importing the training stack
+
+
+def get_round_divisor(rules: TraitorRouletteRules = DEFAULT_RULES) -> int:
+    """
+    Rounds are observed as a fraction of the round after the last one,
+    which is the round of a game that has been played to the end.
+    """
+    return rules.max_rounds + 1
+
+
+def get_observations(game: BatchTraitorRouletteGame, out: np.ndarray = None) -> np.ndarray:
+    """
+    Vectorized version of TraitorRouletteEnv._get_obs for all games.
+    """
+    return create_observations(game.current_rounds, game.bankrolls,
+                               game.max_value, out, game.rules)
+
+
+def create_observations(current_rounds: np.ndarray, bankrolls: np.ndarray,
+                        max_bankroll: int, out: np.ndarray = None,
+                        rules: TraitorRouletteRules = DEFAULT_RULES) -> np.ndarray:
+    if out is None:
+        out = np.zeros((len(bankrolls), 2), dtype=np.float32)
+    # Observation space: [current_round, bankroll]
+    np.divide(current_rounds, get_round_divisor(rules), out=out[:, 0], casting="unsafe")
+    np.divide(bankrolls, max_bankroll, out=out[:, 1], casting="unsafe")
+    return out
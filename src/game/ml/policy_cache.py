@@ -0,0 +1,84 @@
+from collections import OrderedDict
+import numpy as np
+
+from src.game.ml.observations import get_round_divisor
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+
+
+class CachedPolicy():
+    """
+    Wraps a model and caches its deterministic actions per game state.
+    Observations are discretized to (round, bankroll in bet size increments),
+    the least recently used states are dropped once max_size is reached.
+    """
+
+    def __init__(self, model, max_bankroll: int, max_size: int = 1 << 12,
+                 rules: TraitorRouletteRules = DEFAULT_RULES):
+        self._model = model
+        self._max_bankroll = max_bankroll
+        self._max_size = max_size
+        self._round_divisor = get_round_divisor(rules)
+        self._increments = rules.bet_size_increments
+        self._units = max_bankroll // self._increments + 1
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self):
+        return self._model
+
+    def set_model(self, model) -> None:
+        """
+        Replaces the model, e.g. after reloading it, and drops cached actions.
+        """
+        self._model = model
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def predict(self, observation: np.ndarray, deterministic: bool = True):
+        """
+        Same as model.predict for a single observation or a batch of them.
+        """
+        if not deterministic:
+            return self._model.predict(observation, deterministic=False)
+
+        observations = np.reshape(observation, (-1, 2))
+        keys = self._get_keys(observations)
+        unique_keys, first_indices, inverse = np.unique(
+            keys, return_index=True, return_inverse=True)
+
+        unique_actions = [self._cache.get(key) for key in unique_keys.tolist()]
+        missing = [i for i, action in enumerate(unique_actions) if action is None]
+        self.misses += len(missing)
+        self.hits += len(unique_keys) - len(missing)
+
+        if len(missing) > 0:
+            # all states not in the cache are predicted at once
+            missing_actions, _ = self._model.predict(
+                observations[first_indices[missing]], deterministic=True)
+            for i, action in zip(missing, missing_actions):
+                unique_actions[i] = action
+
+        for key, action in zip(unique_keys.tolist(), unique_actions):
+            self._cache[key] = action
+            self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+        actions = np.array(unique_actions)[inverse.ravel()]
+        if np.ndim(observation) == 1:
+            return actions[0], None
+        return actions, None
+
+    def _get_keys(self, observations: np.ndarray) -> np.ndarray:
+        # Observation space: [current_round / round divisor, bankroll / max bankroll]
+        rounds = np.rint(observations[:, 0] * self._round_divisor).astype(np.int64)
+        units = np.rint(observations[:, 1] * self._max_bankroll /
+                        self._increments).astype(np.int64)
+        return rounds * self._units + units
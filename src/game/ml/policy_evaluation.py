@@ -0,0 +1,32 @@
+from fractions import Fraction
+from typing import Dict, Tuple
+import numpy as np
+
+from src.game.exact_evaluation import get_final_bankroll_distribution
+from src.game.ml.observations import create_observations
+from src.game.traitor_roulette_game import BET_SIZE_INCREMENTS, MAX_MULTIPLIER, MAX_ROUNDS, TraitorRouletteGame
+
+
+def get_policy_distribution(model, initial_bankroll: int) -> Tuple[Dict[int, Fraction], float]:
+    """
+    Scores a model over the exact outcome probabilities of the wheel.
+    The model is queried once for all states a game can be in.
+    Returns the exact distribution of final bankrolls and the bet fraction
+    of the first round.
+    """
+    max_bankroll = initial_bankroll * MAX_MULTIPLIER
+
+    rounds, bankrolls = np.meshgrid(
+        np.arange(1, MAX_ROUNDS + 1),
+        np.arange(0, max_bankroll + 1, BET_SIZE_INCREMENTS), indexing="ij")
+    actions, _ = model.predict(create_observations(
+        rounds.ravel(), bankrolls.ravel(), max_bankroll), deterministic=True)
+    bet_fractions = np.reshape(actions, rounds.shape)
+
+    def get_bet_size(game: TraitorRouletteGame) -> int:
+        bet_fraction = bet_fractions[game.current_round - 1,
+                                     game.bankroll // BET_SIZE_INCREMENTS]
+        return game.get_valid_bet_size(float(bet_fraction * 100))
+
+    distribution = get_final_bankroll_distribution(initial_bankroll, get_bet_size)
+    return distribution, float(bet_fractions[0, initial_bankroll // BET_SIZE_INCREMENTS])
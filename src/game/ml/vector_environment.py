@@ -0,0 +1,107 @@
+from typing import Any, List
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.ml.ml_environment import create_action_space, create_observation_space
+from src.game.ml.observations import get_observations
+from src.game.pocket import PocketType
+from src.game.random_numbers import create_generator
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+
+
+def bankrolls_to_rewards(bankrolls: np.ndarray, initial_bankroll: int = 68000,
+                         max_bankroll: int = 204000) -> np.ndarray:
+    """
+    Vectorized version of bankroll_to_reward.
+    """
+    return np.where(bankrolls >= initial_bankroll,
+                    # reward winnings
+                    (bankrolls - initial_bankroll) /
+                    (max_bankroll - initial_bankroll),
+                    # punish losses
+                    -1 + (bankrolls / initial_bankroll))
+
+
+class TraitorRouletteVecEnv(VecEnv):
+    """
+    Steps many games of Traitor Roulette at once.
+    Finished games are reset automatically, their last observation
+    and final bankroll are passed in the infos.
+    """
+
+    def __init__(self, initial_bankroll: int, n_envs: int = 1, seed: int = None,
+                 rules: TraitorRouletteRules = DEFAULT_RULES):
+        self.render_mode = None
+        self.initial_bankroll = initial_bankroll
+        self.game = BatchTraitorRouletteGame(
+            initial_bankroll, n_envs, create_generator(seed), rules=rules)
+        self.max_bankroll = self.game.max_value
+        self._colors = np.array([PocketType.RED.value, PocketType.BLACK.value])
+        self._actions = np.zeros(n_envs, dtype=np.float32)
+
+        # buffers are reused between steps
+        self._observations = np.zeros((n_envs, 2), dtype=np.float32)
+        self._rewards = np.zeros(n_envs, dtype=np.float32)
+        self._dones = np.zeros(n_envs, dtype=bool)
+
+        super().__init__(n_envs, create_observation_space(), create_action_space())
+
+    def reset(self) -> np.ndarray:
+        if self._seeds[0] is not None:
+            self.game.set_rng(create_generator(self._seeds[0]))
+        self._reset_seeds()
+        self.game.reset()
+        self._update_observations()
+        return self._observations.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions[:] = np.reshape(actions, self.num_envs)
+
+    def step_wait(self):
+        bet_sizes = self.game.get_valid_bet_size(self._actions * 100)
+        colors = self.game.rng.choice(self._colors, size=self.num_envs)
+        self.game.play(bet_sizes, colors)
+
+        self._update_rewards()
+        np.copyto(self._dones, self.game.has_game_ended())
+        self._update_observations()
+
+        infos = [{} for _ in range(self.num_envs)]
+        done_indices = np.flatnonzero(self._dones)
+        for i in done_indices:
+            infos[i]["terminal_observation"] = self._observations[i].copy()
+            infos[i]["final_bankroll"] = int(self.game.bankrolls[i])
+            infos[i]["TimeLimit.truncated"] = False
+
+        if len(done_indices) > 0:
+            self.game.reset(done_indices)
+            self._update_observations()
+
+        # observations are copied as callers keep them across steps
+        return self._observations.copy(), self._rewards.copy(), \
+            self._dones.copy(), infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        # all environments share their attributes
+        return [getattr(self, attr_name)] * len(self._get_indices(indices))
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(self._get_indices(indices))
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False] * len(self._get_indices(indices))
+
+    def _update_observations(self) -> None:
+        get_observations(self.game, self._observations)
+
+    def _update_rewards(self) -> None:
+        np.copyto(self._rewards, bankrolls_to_rewards(
+            self.game.bankrolls, self.initial_bankroll, self.max_bankroll))
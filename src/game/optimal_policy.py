@@ -0,0 +1,85 @@
+from fractions import Fraction
+from typing import Dict, Tuple
+import numpy as np
+from src.game.exact_evaluation import get_next_bankroll, get_pocket_probabilities, create_game_in_state
+from src.game.traitor_roulette_game import BET_SIZE_INCREMENTS, MAX_MULTIPLIER, MAX_ROUNDS
+
+
+class OptimalPolicy():
+    """
+    Lookup table of the expected value optimal bet
+    for every (round, bankroll) state of a game.
+    Bankrolls are indexed in units of the bet size increments.
+    """
+
+    def __init__(self, initial_bankroll: int, bets: np.ndarray, values: np.ndarray) -> None:
+        self.initial_bankroll = initial_bankroll
+        # bet per state, 0 for states that are not reachable or have ended
+        self.bets = bets
+        # expected final bankroll per state
+        self.values = values
+
+    def get_bet_size(self, current_round: int, bankroll: int) -> int:
+        return int(self.bets[current_round - 1, bankroll // BET_SIZE_INCREMENTS])
+
+    def get_expected_value(self, current_round: int, bankroll: int) -> float:
+        return float(self.values[current_round - 1, bankroll // BET_SIZE_INCREMENTS])
+
+    @property
+    def expected_value(self) -> float:
+        return self.get_expected_value(1, self.initial_bankroll)
+
+    def save(self, file_path: str) -> None:
+        np.savez_compressed(file_path, initial_bankroll=self.initial_bankroll,
+                            bets=self.bets, values=self.values)
+
+    @staticmethod
+    def load(file_path: str) -> "OptimalPolicy":
+        with np.load(file_path) as data:
+            return OptimalPolicy(int(data["initial_bankroll"]),
+                                 data["bets"], data["values"])
+
+
+def solve_optimal_policy(initial_bankroll: int) -> OptimalPolicy:
+    """
+    Computes the expected value optimal bet for every reachable state
+    by backward induction over the rounds.
+    """
+    pocket_probabilities = get_pocket_probabilities()
+    units = initial_bankroll * MAX_MULTIPLIER // BET_SIZE_INCREMENTS
+    bets = np.zeros((MAX_ROUNDS, units + 1), dtype=np.int64)
+    values = np.zeros((MAX_ROUNDS, units + 1), dtype=np.float64)
+    memo: Dict[Tuple[int, int], Fraction] = {}
+
+    def solve(current_round: int, bankroll: int) -> Fraction:
+        key = (current_round, bankroll)
+        if key in memo:
+            return memo[key]
+
+        game = create_game_in_state(initial_bankroll, current_round, bankroll)
+        if game.has_game_ended():
+            if current_round <= MAX_ROUNDS:
+                values[current_round - 1, bankroll // BET_SIZE_INCREMENTS] = bankroll
+            memo[key] = Fraction(bankroll)
+            return memo[key]
+
+        best_bet = 0
+        best_value = None
+        max_bet = min(bankroll, initial_bankroll)
+        for bet in range(BET_SIZE_INCREMENTS, max_bet + 1, BET_SIZE_INCREMENTS):
+            value = sum(probability * solve(current_round + 1, get_next_bankroll(
+                initial_bankroll, current_round, bankroll, bet, pocket))
+                for pocket, probability in pocket_probabilities)
+            # on ties prefer the smaller bet
+            if best_value is None or value > best_value:
+                best_bet = bet
+                best_value = value
+
+        bets[current_round - 1, bankroll // BET_SIZE_INCREMENTS] = best_bet
+        values[current_round - 1, bankroll // BET_SIZE_INCREMENTS] = best_value
+        memo[key] = best_value
+        return best_value
+
+    solve(1, initial_bankroll)
+
+    return OptimalPolicy(initial_bankroll, bets, values)
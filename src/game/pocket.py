@@ -1,4 +1,3 @@
-
 from enum import Enum
 
 class PocketType(Enum):
@@ -8,10 +7,25 @@ class PocketType(Enum):
     TRAITOR = 3
 
 class Pocket():
+    """
+    Immutable pocket of a roulette wheel.
+    Pockets are interned, creating the same pocket twice returns the same
+    instance, therefore they can be shared without copying.
+    """
+
+    __slots__ = ("_number", "_type")
+
+    _instances = {}
 
-    def __init__(self, number: int, type: PocketType) -> None:
-        self._number = number
-        self._type = type
+    def __new__(cls, number: int, type: PocketType) -> "Pocket":
+        key = (number, type)
+        pocket = cls._instances.get(key)
+        if pocket is None:
+            pocket = super().__new__(cls)
+            object.__setattr__(pocket, "_number", number)
+            object.__setattr__(pocket, "_type", type)
+            cls._instances[key] = pocket
+        return pocket
 
     @property
     def number(self) -> int:
@@ -20,6 +34,15 @@ class Pocket():
     @property
     def type(self) -> PocketType:
         return self._type
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("Pocket is immutable")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError("Pocket is immutable")
+
+    def __reduce__(self):
+        return (Pocket, (self._number, self._type))
     
     def __eq__(self, other) -> bool: 
         if isinstance(self, other.__class__):
@@ -0,0 +1,47 @@
+from typing import Union
+import numpy as np
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+def create_generator(seed: Seed = None) -> np.random.Generator:
+    """
+    Creates a generator with a counter-based bit generator.
+    Streams of different seeds are independent, which makes
+    the generators safe to use in parallel processes.
+    """
+    return np.random.Generator(np.random.Philox(seed))
+
+
+class RandomIntegers():
+    """
+    Draws random integers from 0 to high - 1 one at a time.
+    The integers are generated in chunks, drawing a single integer
+    from a generator costs more than generating thousands at once.
+    Without a generator an unseeded one is created when it is first needed.
+    """
+
+    def __init__(self, rng: np.random.Generator, high: int, chunk_size: int = 1 << 12):
+        self._rng = rng
+        self._high = high
+        self._chunk_size = chunk_size
+        self._chunk = []
+        self._index = 0
+
+    @property
+    def rng(self) -> np.random.Generator:
+        # seeding from the operating system is slow,
+        # games that are never played should not pay for it
+        if self._rng is None:
+            self._rng = create_generator()
+        return self._rng
+
+    def next(self) -> int:
+        if self._index == len(self._chunk):
+            # lists are faster to index than arrays for single values
+            self._chunk = self.rng.integers(
+                0, self._high, size=self._chunk_size).tolist()
+            self._index = 0
+        result = self._chunk[self._index]
+        self._index += 1
+        return result
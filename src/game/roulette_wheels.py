@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-import copy
-import random
-from typing import List
-from src.game.pocket import Pocket, PocketType
+from typing import List, Tuple
+import numpy as np
+from src.game.pocket import Pocket
+from src.game.random_numbers import RandomIntegers
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
 
 
 class RouletteWheel(ABC):
@@ -11,34 +12,47 @@ class RouletteWheel(ABC):
     def spin(self) -> Pocket:
         pass
 
+    @abstractmethod
+    def spin_many(self, n: int, rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Spins the wheel n times, by default with the generator of the wheel.
+        Returns the pocket numbers and the PocketType values of the spins.
+        """
+        pass
+
 
 class TraitorRouletteWheel(RouletteWheel):
 
     _wheel = []
 
-    def __init__(self) -> None:
+    def __init__(self, rng: np.random.Generator = None,
+                 rules: TraitorRouletteRules = DEFAULT_RULES) -> None:
         super().__init__()
-        self._wheel = self._generate_wheel()
+        # the layout of the wheel is shared by all wheels with the same rules
+        self._wheel = rules.pockets
+        self._numbers = rules.pocket_numbers
+        self._types = rules.pocket_types
+        self.set_rng(rng)
+
+    @property
+    def rng(self) -> np.random.Generator:
+        return self._indices.rng
+
+    def set_rng(self, rng: np.random.Generator = None) -> None:
+        """
+        Spins the wheel with another generator, a new unseeded one by default.
+        Pockets drawn from the previous generator are discarded.
+        """
+        self._indices = RandomIntegers(rng, len(self._wheel))
 
     def spin(self) -> Pocket:
-        choses_pocket = random.choice(self._wheel)
-        # returning copy to avoid messing up the wheel by accident
-        return copy.deepcopy(choses_pocket)
+        # pockets are immutable, therefore no copy is needed
+        return self._wheel[self._indices.next()]
 
-    def _generate_wheel(self) -> List[Pocket]:
-        result = []
-
-        result.append(Pocket(0, PocketType.GREEN))
-
-        for i in range(1, 37):
-            if i % 3 == 0:
-                result.append(Pocket(i, PocketType.TRAITOR))
-            elif i % 2 == 0:
-                result.append(Pocket(i, PocketType.BLACK))
-            else:
-                result.append(Pocket(i, PocketType.RED))
-
-        return result
+    def spin_many(self, n: int, rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+        rng = rng if rng is not None else self.rng
+        indices = rng.integers(0, len(self._wheel), size=n)
+        return self._numbers[indices], self._types[indices]
 
 
 class RiggedWheel(RouletteWheel):
@@ -50,9 +64,20 @@ class RiggedWheel(RouletteWheel):
         if len(pockets) == 0:
             raise ValueError("pockets must not be empty")
         self._pockets = pockets
+        self._numbers = np.array(
+            [pocket.number for pocket in pockets], dtype=np.int8)
+        self._types = np.array(
+            [pocket.type.value for pocket in pockets], dtype=np.int8)
 
     def spin(self) -> Pocket:
         result = self._pockets[self._spin_count % len(self._pockets)]
         self._spin_count += 1
         return result
 
+    def spin_many(self, n: int, rng: np.random.Generator = None) -> Tuple[np.ndarray, np.ndarray]:
+        # the rigged wheel ignores the random number generator
+        indices = (self._spin_count + np.arange(n)) % len(self._pockets)
+        self._spin_count += n
+        return self._numbers[indices], self._types[indices]
+
+
@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import numpy as np
+from src.game.pocket import Pocket, PocketType
+
+
+@dataclass(frozen=True)
+class TraitorRouletteRules():
+    """
+    Rules of a Traitor Roulette game.
+    Tables derived from the rules are computed once when the rules are
+    created, games and wheels sharing the rules only look them up.
+    """
+
+    max_rounds: int = 3
+    # the bankroll is capped at this multiple of the initial bankroll
+    max_multiplier: int = 3
+    bet_size_increments: int = 2000
+    # multiples of the bet that are paid out, the bet included
+    color_payout: int = 2
+    traitor_payout: int = 3
+    # pockets numbered 1 to numbers_count, every traitor_divisor-th is a traitor
+    numbers_count: int = 36
+    traitor_divisor: int = 3
+
+    pockets: Tuple[Pocket, ...] = field(init=False, repr=False, compare=False)
+    pocket_numbers: np.ndarray = field(init=False, repr=False, compare=False)
+    pocket_types: np.ndarray = field(init=False, repr=False, compare=False)
+    # payout multiple per prediction and pocket type, indexed by their values
+    payouts: np.ndarray = field(init=False, repr=False, compare=False)
+    # same table for single games, looking up numpy arrays is slow for scalars
+    _payouts_by_type: Dict[Tuple[PocketType, PocketType], int] = field(
+        init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        pockets = tuple(self._generate_pockets())
+        payouts = np.zeros((len(PocketType), len(PocketType)), dtype=np.int64)
+        for prediction in [PocketType.RED, PocketType.BLACK]:
+            payouts[prediction.value, prediction.value] = self.color_payout
+            payouts[prediction.value, PocketType.TRAITOR.value] = self.traitor_payout
+
+        # the rules are frozen, the tables are set once and never changed
+        object.__setattr__(self, "pockets", pockets)
+        object.__setattr__(self, "pocket_numbers", self._freeze(np.array(
+            [pocket.number for pocket in pockets], dtype=np.int8)))
+        object.__setattr__(self, "pocket_types", self._freeze(np.array(
+            [pocket.type.value for pocket in pockets], dtype=np.int8)))
+        object.__setattr__(self, "payouts", self._freeze(payouts))
+        object.__setattr__(self, "_payouts_by_type", {
+            (prediction, pocket_type): int(payouts[prediction.value, pocket_type.value])
+            for prediction in PocketType for pocket_type in PocketType})
+
+    def get_max_bankroll(self, initial_bankroll: int) -> int:
+        return initial_bankroll * self.max_multiplier
+
+    def get_payout(self, prediction: PocketType, pocket_type: PocketType) -> int:
+        return self._payouts_by_type[prediction, pocket_type]
+
+    def _generate_pockets(self):
+        yield Pocket(0, PocketType.GREEN)
+
+        for i in range(1, self.numbers_count + 1):
+            if i % self.traitor_divisor == 0:
+                yield Pocket(i, PocketType.TRAITOR)
+            elif i % 2 == 0:
+                yield Pocket(i, PocketType.BLACK)
+            else:
+                yield Pocket(i, PocketType.RED)
+
+    @staticmethod
+    def _freeze(array: np.ndarray) -> np.ndarray:
+        array.flags.writeable = False
+        return array
+
+
+DEFAULT_RULES = TraitorRouletteRules()
@@ -1,22 +1,29 @@
 
 
 from typing import Tuple
+import numpy as np
 from src.game.pocket import PocketType, Pocket
 from src.game.roulette_wheels import RouletteWheel, TraitorRouletteWheel
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
 
-MAX_ROUNDS = 3
-MAX_MULTIPLIER = 3
-BET_SIZE_INCREMENTS = 2000
+# rules of the show, other rules can be passed to the games
+MAX_ROUNDS = DEFAULT_RULES.max_rounds
+MAX_MULTIPLIER = DEFAULT_RULES.max_multiplier
+BET_SIZE_INCREMENTS = DEFAULT_RULES.bet_size_increments
 
 
 class TraitorRouletteGame():
 
-    def __init__(self, initial_bankroll: int, wheel: RouletteWheel = TraitorRouletteWheel()):
+    def __init__(self, initial_bankroll: int, wheel: RouletteWheel = None,
+                 rules: TraitorRouletteRules = DEFAULT_RULES,
+                 rng: np.random.Generator = None):
         self._initial_bankroll = initial_bankroll
         self._bankroll = initial_bankroll
-        self._max_bankroll = initial_bankroll * MAX_MULTIPLIER
+        self._max_bankroll = rules.get_max_bankroll(initial_bankroll)
         self._round = 1
-        self._wheel = wheel
+        self._rules = rules
+        # the generator is used by the default wheel, a given wheel spins with its own
+        self._wheel = wheel if wheel is not None else TraitorRouletteWheel(rng, rules)
 
     @property
     def bankroll(self):
@@ -34,10 +41,14 @@ class TraitorRouletteGame():
     def max_value(self):
         return self._max_bankroll
 
+    @property
+    def rules(self) -> TraitorRouletteRules:
+        return self._rules
+
     def has_game_ended(self) -> bool:
         return self._bankroll == 0 or \
             self._bankroll >= self._max_bankroll or \
-            self._round > MAX_ROUNDS
+            self._round > self._rules.max_rounds
 
     def reset(self):
         self._bankroll = self._initial_bankroll
@@ -49,8 +60,9 @@ class TraitorRouletteGame():
         '''
         if bet > self._initial_bankroll:
             raise ValueError("Bet must be less than initial bankroll")
-        if bet % 2000 != 0 and self.bankroll >= 2000:
-            raise ValueError("Bet must be a multiple of 2000")
+        increments = self._rules.bet_size_increments
+        if bet % increments != 0 and self.bankroll >= increments:
+            raise ValueError(f"Bet must be a multiple of {increments}")
         if bet > self._bankroll:
             raise ValueError("Bet must be less than bankroll")
         if prediction not in [PocketType.RED, PocketType.BLACK]:
@@ -58,19 +70,24 @@ class TraitorRouletteGame():
         if self.has_game_ended():
             raise ValueError("Game has ended")
 
+        return self.play_unchecked(bet, prediction)
+
+    def play_unchecked(self, bet: int, prediction: PocketType) -> Tuple[Pocket, int]:
+        '''
+        Same as play without validating the bet, the prediction and
+        whether the game has ended. Meant for simulations that only
+        place valid bets, e.g. from get_valid_bet_size.
+        Returns the winnings
+        '''
         self._bankroll -= bet
 
         pocket = self._wheel.spin()
 
-        winnings = 0
-        if pocket.type == PocketType.TRAITOR:
-            winnings = bet * 3
-        elif pocket.type == prediction:
-            winnings = bet * 2
+        winnings = bet * self._rules.get_payout(prediction, pocket.type)
 
-        # cannot win more that 3x the initial bankroll
-        if winnings + self.bankroll > self._max_bankroll:
-            winnings = self._max_bankroll - self.bankroll
+        # cannot win more than the maximum bankroll
+        if winnings + self._bankroll > self._max_bankroll:
+            winnings = self._max_bankroll - self._bankroll
 
         self._bankroll += winnings
         self._round += 1
@@ -82,12 +99,13 @@ class TraitorRouletteGame():
         Implements constraints on betting size.
         Return a valid bet size based on the percentage of the bankroll to bet.
         """
+        increments = self._rules.bet_size_increments
         bet_size = self._bankroll * (bet_percentage / 100)
-        bet_size = round(bet_size / 2000) * 2000
+        bet_size = round(bet_size / increments) * increments
 
         # cannot bet 0
         if bet_size == 0:
-            bet_size = 2000
+            bet_size = increments
         # cannot bet more than current bankroll
         if bet_size > self._bankroll:
             bet_size = self._bankroll
@@ -0,0 +1,222 @@
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import Executor
+from contextlib import contextmanager
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from src.common import generate_filepath
+
+
+def add_profile_arguments(parser: ArgumentParser) -> None:
+    """
+    Adds the arguments shared by all entry points to profile a run.
+    """
+    parser.add_argument('--profile', dest='profile', action='store_true',
+                        help='profile the run and write the results to the output folder')
+    parser.add_argument('--profile-interval', dest='profile_interval',
+                        default=None, type=float,
+                        help='sample the call stack every given seconds instead of tracing every call, keeps the overhead low on long runs')
+    parser.add_argument('--profile-top', dest='profile_top',
+                        default=32, type=int,
+                        help='set the number of functions in the profile summary, default is 32')
+
+
+class SamplingProfiler():
+    """
+    Periodically records the call stack of a thread.
+    """
+
+    def __init__(self, interval: float, thread_id: int = None) -> None:
+        self._interval = interval
+        self._thread_id = thread_id if thread_id is not None \
+            else threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self.samples = 0
+        self.self_counts = Counter()
+        self.cumulative_counts = Counter()
+        self.stacks = Counter()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            functions = []
+            while frame is not None:
+                code = frame.f_code
+                functions.append(
+                    f"{code.co_filename}:{code.co_firstlineno}({code.co_name})")
+                frame = frame.f_back
+
+            self.samples += 1
+            self.self_counts[functions[0]] += 1
+            self.cumulative_counts.update(set(functions))
+            self.stacks[";".join(reversed(functions))] += 1
+
+    def write_summary(self, file_path: str, top: int) -> None:
+        with open(file_path, "w") as f:
+            f.write(f"{self.samples} samples every {self._interval} seconds\n")
+            f.write("Self samples, Cumulative samples, Function\n")
+            for function, count in self.self_counts.most_common(top):
+                f.write(f"{count}, {self.cumulative_counts[function]}, {function}\n")
+
+    def write_stacks(self, file_path: str) -> None:
+        # collapsed stacks, one line per stack, as used by flame graph tools
+        with open(file_path, "w") as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+    def get_counts(self) -> tuple:
+        return self.samples, self.self_counts, self.cumulative_counts, self.stacks
+
+    def add_counts(self, counts: tuple) -> None:
+        """
+        Adds the counts of another profiler, e.g. of a worker process.
+        """
+        samples, self_counts, cumulative_counts, stacks = counts
+        self.samples += samples
+        self.self_counts.update(self_counts)
+        self.cumulative_counts.update(cumulative_counts)
+        self.stacks.update(stacks)
+
+
+class _ProfiledCall():
+    """
+    Calls a function under a profiler in a worker process.
+    Returns the result together with the profile, which is merged
+    into the profile of the parent process.
+    """
+
+    def __init__(self, function, interval: float = None) -> None:
+        self._function = function
+        self._interval = interval
+
+    def __call__(self, *args):
+        if self._interval is None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                result = self._function(*args)
+            finally:
+                profiler.disable()
+            profiler.create_stats()
+            return result, profiler.stats
+
+        profiler = SamplingProfiler(self._interval)
+        profiler.start()
+        try:
+            result = self._function(*args)
+        finally:
+            profiler.stop()
+        return result, profiler.get_counts()
+
+
+class _WorkerStats():
+    """
+    Stats of a worker process in the form pstats can load.
+    """
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class _Session():
+    """
+    The profiler of the parent process and the profiles of its workers.
+    """
+
+    def __init__(self, interval: float = None) -> None:
+        self.interval = interval
+        self.profiler = cProfile.Profile() if interval is None \
+            else SamplingProfiler(interval)
+        self.worker_profiles = []
+
+
+_session = None
+
+
+def map_profiled(executor: Executor, function, *iterables):
+    """
+    Same as executor.map, but while profiling each call is profiled
+    in its worker process and merged into the profile of the run.
+    Without this only the parent waiting on the workers is profiled.
+    """
+    if _session is None:
+        yield from executor.map(function, *iterables)
+        return
+
+    session = _session
+    tracing = session.interval is None
+    # workers forked while tracing would inherit the tracer of the parent
+    if tracing:
+        session.profiler.disable()
+    try:
+        futures = [executor.submit(_ProfiledCall(function, session.interval), *args)
+                   for args in zip(*iterables)]
+    finally:
+        if tracing:
+            session.profiler.enable()
+
+    for future in futures:
+        result, worker_profile = future.result()
+        session.worker_profiles.append(worker_profile)
+        yield result
+
+
+@contextmanager
+def profile(name: str, enabled: bool, interval: float = None, top: int = 32):
+    """
+    Profiles the code inside the context if enabled.
+    Without an interval every call is traced with cProfile and a pstats dump
+    is written, otherwise the call stack is sampled.
+    Both write a summary of the top functions to the output folder.
+    Calls distributed to workers with map_profiled are included.
+    """
+    global _session
+    if not enabled:
+        yield
+        return
+
+    session = _Session(interval)
+    _session = session
+    if interval is None:
+        session.profiler.enable()
+    else:
+        session.profiler.start()
+    try:
+        yield
+    finally:
+        _session = None
+        if interval is None:
+            session.profiler.disable()
+            stats = pstats.Stats(session.profiler, *[
+                _WorkerStats(worker_stats) for worker_stats in session.worker_profiles])
+            stats.dump_stats(generate_filepath(f"{name}_profile.pstats"))
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+            with open(generate_filepath(f"{name}_profile.txt"), "w") as f:
+                f.write(summary.getvalue())
+        else:
+            session.profiler.stop()
+            for counts in session.worker_profiles:
+                session.profiler.add_counts(counts)
+            session.profiler.write_stacks(
+                generate_filepath(f"{name}_profile.folded"))
+            session.profiler.write_summary(
+                generate_filepath(f"{name}_profile.txt"), top)
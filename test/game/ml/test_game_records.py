@@ -0,0 +1,97 @@
+import os
+import tempfile
+import numpy as np
+from src.game.ml.game_records import GameRecords, concatenate_game_records, \
+    create_game_records, get_bankroll_histogram, get_bankroll_matrix, get_final_records, \
+    get_records_count, load_game_records, sample_bankroll_matrix, save_game_records, \
+    select_game_records
+
+
+def create_test_records() -> GameRecords:
+    # game 10 ends after the first round, game 11 is played for two rounds
+    playing = np.array([[True, True], [False, True]])
+    bankrolls = np.array([[0, 70000], [0, 72000]])
+    bet_fractions = np.array([[1, .5], [.2, .25]], dtype=np.float32)
+    return create_game_records(10, 68000, playing, bankrolls, bet_fractions)
+
+
+def test_create_game_records():
+    records = create_test_records()
+
+    assert records["game_id"].tolist() == [10, 10, 11, 11, 11]
+    assert records["round"].tolist() == [0, 1, 0, 1, 2]
+    assert records["bankroll"].tolist() == [68000, 0, 68000, 70000, 72000]
+    assert np.isnan(records["bet_fraction"][0])
+    assert records["bet_fraction"][4] == .25
+    assert all(column.flags.c_contiguous for column in records.values()), \
+        "records should be stored as contiguous columns"
+
+
+def test_concatenate_game_records():
+    records = create_test_records()
+
+    concatenated = concatenate_game_records([records, records])
+
+    assert get_records_count(concatenated) == 10
+    assert concatenated["round"].tolist() == [0, 1, 0, 1, 2] * 2
+
+
+def test_get_final_records():
+    final_records = get_final_records(create_test_records())
+
+    assert final_records["bankroll"].tolist() == [0, 72000]
+    assert final_records["round"].tolist() == [1, 2]
+
+
+def test_get_bankroll_matrix():
+    matrix = get_bankroll_matrix(create_test_records())
+
+    assert matrix.shape == (2, 4)
+    assert matrix[0, :2].tolist() == [68000, 0]
+    assert np.all(np.isnan(matrix[0, 2:])), "rounds not played should be nan"
+    assert matrix[1, :3].tolist() == [68000, 70000, 72000]
+
+
+def test_get_bankroll_matrix_of_sparse_games():
+    records = create_test_records()
+
+    matrix = get_bankroll_matrix(select_game_records(records, records["game_id"] == 11))
+
+    assert matrix.shape == (1, 4), "only the given games should have rows"
+    assert matrix[0, :3].tolist() == [68000, 70000, 72000]
+
+
+def test_get_bankroll_histogram():
+    histogram = get_bankroll_histogram(create_test_records(), 204000,
+                                       chunk_size=2)
+
+    assert histogram.shape == (4, 103)
+    assert histogram.sum() == 5, "every record should be counted once"
+    assert histogram[0, 34] == 2, "both games start with 68000"
+    assert histogram[1, 0] == 1 and histogram[1, 35] == 1
+    assert histogram[2, 36] == 1
+    assert histogram[3].sum() == 0, "no game reached the third round"
+
+
+def test_sample_bankroll_matrix():
+    records = create_test_records()
+
+    matrix = sample_bankroll_matrix(records, 1, np.random.default_rng(0))
+    assert matrix.shape == (1, 4)
+
+    matrix = sample_bankroll_matrix(records, 8)
+    assert matrix.shape == (2, 4), "all games should be sampled at most once"
+
+
+def test_save_and_load():
+    records = create_test_records()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "games.npz")
+        save_game_records(records, file_path)
+        loaded = load_game_records(file_path)
+
+    assert loaded.keys() == records.keys()
+    for name, column in records.items():
+        assert column.dtype == loaded[name].dtype
+        assert np.array_equal(loaded[name], column, equal_nan=True)
@@ -0,0 +1,41 @@
+import numpy as np
+from src.game.ml.loss_history import LossHistory
+
+
+def test_keeps_all_losses_below_capacity():
+    history = LossHistory(2, window_size=4, capacity=16)
+    for step in range(10):
+        history.append(step, step, -step)
+
+    assert len(history) == 10
+    assert history.get_steps().tolist() == list(range(10))
+    assert history.get_losses(1).tolist() == [-step for step in range(10)]
+
+
+def test_moving_averages_match_convolution():
+    window_size = 8
+    losses = np.random.default_rng(0).random(1000)
+    history = LossHistory(1, window_size=window_size, capacity=64)
+    for step, loss in enumerate(losses):
+        history.append(step, loss)
+
+    steps, averages = history.get_moving_averages(0)
+    expected = np.convolve(losses, np.ones(window_size) / window_size,
+                           mode='valid')
+
+    assert np.allclose(averages, expected[steps.astype(int) - window_size + 1]), \
+        "streaming averages should match the averages over all losses"
+
+
+def test_downsamples_evenly_within_capacity():
+    capacity = 64
+    history = LossHistory(1, capacity=capacity)
+    for step in range(10000):
+        history.append(step, step)
+
+    steps = history.get_steps()
+    assert capacity // 2 <= len(history) <= capacity
+    assert steps[0] == 0, "the first loss should be kept"
+    assert np.all(np.diff(steps) == history.stride), \
+        "kept losses should be evenly spaced"
+    assert steps[-1] > 10000 - history.stride, "the run should be covered to its end"
@@ -1,3 +1,5 @@
+import numpy as np
+import pytest
 
 from src.game.ml.ml_environment import TraitorRouletteEnv, reward_to_bankroll
 
@@ -40,3 +42,33 @@ def test_get_bankroll():
         2, "bankroll should be initial_bankroll / 2"
     assert reward_to_bankroll(-1, initial_bankroll,
                               max_bankroll) == 0, "bankroll should be 0"
+
+
+def test_reset_seed_controls_spins():
+    def play(env: TraitorRouletteEnv, seed: int) -> list:
+        observations = [env.reset(seed=seed)[0]]
+        for _ in range(64):
+            observation, _, done, _, _ = env.step(np.float32(.3))
+            observations.append(observation)
+            if done:
+                observations.append(env.reset()[0])
+        return np.array(observations).tolist()
+
+    env = TraitorRouletteEnv(68000)
+    observations = play(env, 7)
+
+    assert play(TraitorRouletteEnv(68000), 7) == observations, \
+        "environments with the same seed should play the same games"
+    assert play(env, 7) == observations, "reseeding should replay the games"
+    assert play(env, 8) != observations
+
+
+def test_step_after_game_has_ended():
+    env = TraitorRouletteEnv(68000)
+    env.reset(seed=0)
+    done = False
+    while not done:
+        _, _, done, _, _ = env.step(np.float32(1))
+
+    with pytest.raises(ValueError):
+        env.step(np.float32(1))
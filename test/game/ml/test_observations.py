@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import numpy as np
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.ml.ml_environment import TraitorRouletteEnv
+from src.game.ml.observations import create_observations, get_observations
+from src.game.rules import TraitorRouletteRules
+
+
+def test_get_observations():
+    game = BatchTraitorRouletteGame(68000, 2)
+    game._bankrolls[:] = [0, 204000]
+    game._rounds[:] = [2, 4]
+
+    observations = get_observations(game)
+
+    assert observations.dtype == np.float32
+    assert np.allclose(observations, [[.5, 0], [1, 1]])
+
+
+def test_create_observations_into_buffer():
+    out = np.zeros((2, 2), dtype=np.float32)
+
+    observations = create_observations(np.array([1, 3]),
+                                       np.array([51000, 102000]), 204000, out)
+
+    assert observations is out, "observations should be written into the buffer"
+    assert np.allclose(out, [[.25, .25], [.75, .5]])
+
+
+def test_observations_of_rules():
+    rules = TraitorRouletteRules(max_rounds=5)
+    game = BatchTraitorRouletteGame(68000, 2, rules=rules)
+    game._rounds[:] = [1, 6]
+
+    assert np.allclose(get_observations(game)[:, 0], [1 / 6, 1]), \
+        "the round should be normalized by the rounds of the rules"
+
+    env = TraitorRouletteEnv(68000, rules)
+    env.game._round = 6
+    assert np.isclose(env._get_obs()[0], 1)
+
+
+def test_import_without_training_stack():
+    # querying a model must not pay for importing the training stack
+    modules = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; import src.game.ml.policy_evaluation, src.game.ml.policy_cache; "
+         "print(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True).stdout.split()
+
+    for heavy_module in ["gymnasium", "stable_baselines3", "torch", "matplotlib"]:
+        assert heavy_module not in modules, f"{heavy_module} should not be imported"
@@ -0,0 +1,78 @@
+import numpy as np
+from src.game.ml.policy_cache import CachedPolicy
+from src.game.ml.observations import create_observations
+from src.game.rules import TraitorRouletteRules
+
+
+class CountingModel():
+
+    def __init__(self, offset: float = 0):
+        self.observations_count = 0
+        self.offset = offset
+
+    def predict(self, observation, deterministic=False):
+        self.observations_count += len(observation)
+        return observation[:, 1] + self.offset, None
+
+
+def test_predict_caches_states():
+    max_bankroll = 204000
+    model = CountingModel()
+    policy = CachedPolicy(model, max_bankroll)
+    observations = create_observations(np.array([1, 1, 2, 1]),
+                                       np.array([68000, 68000, 70000, 72000]),
+                                       max_bankroll)
+
+    actions, _ = policy.predict(observations)
+    assert np.allclose(actions, observations[:, 1])
+    assert model.observations_count == 3, "each state should be predicted once"
+
+    actions, _ = policy.predict(observations[0])
+    assert np.isclose(actions, observations[0, 1])
+    assert model.observations_count == 3, "cached states should not be predicted"
+    assert policy.hits == 1
+
+
+def test_max_size():
+    max_bankroll = 204000
+    model = CountingModel()
+    policy = CachedPolicy(model, max_bankroll, max_size=2)
+    observations = create_observations(np.array([1, 2, 3]),
+                                       np.array([68000, 68000, 68000]),
+                                       max_bankroll)
+
+    for observation in observations:
+        policy.predict(observation)
+    assert len(policy) == 2
+
+    # the least recently used state has been dropped
+    policy.predict(observations[0])
+    assert model.observations_count == 4
+
+
+def test_set_model_invalidates():
+    max_bankroll = 204000
+    policy = CachedPolicy(CountingModel(), max_bankroll)
+    observation = create_observations(np.array([1]), np.array([68000]),
+                                      max_bankroll)
+
+    policy.predict(observation)
+    policy.set_model(CountingModel(offset=1))
+    actions, _ = policy.predict(observation)
+
+    assert np.isclose(actions[0], observation[0, 1] + 1), \
+        "actions of the new model should be used"
+
+
+def test_keys_of_rules():
+    rules = TraitorRouletteRules(max_rounds=5, bet_size_increments=1000)
+    max_bankroll = 204000
+    model = CountingModel()
+    policy = CachedPolicy(model, max_bankroll, rules=rules)
+    # all rounds of the rules and bankrolls one increment apart are distinct states
+    rounds, bankrolls = np.meshgrid(np.arange(1, 7), [68000, 69000], indexing="ij")
+    observations = create_observations(rounds.ravel(), bankrolls.ravel(),
+                                       max_bankroll, rules=rules)
+
+    policy.predict(observations)
+    assert model.observations_count == len(observations)
@@ -0,0 +1,34 @@
+import numpy as np
+from src.game.exact_evaluation import get_bet_percentage_distribution
+from src.game.ml.policy_evaluation import get_policy_distribution
+
+
+class ConstantModel():
+
+    def __init__(self, bet_fraction: float):
+        self.bet_fraction = bet_fraction
+
+    def predict(self, observation, deterministic=False):
+        return np.full(len(observation), self.bet_fraction, dtype=np.float32), None
+
+
+class BankrollModel():
+
+    def predict(self, observation, deterministic=False):
+        # bets the share of the maximum bankroll the game is at
+        return observation[:, 1], None
+
+
+def test_get_policy_distribution():
+    distribution, bet_fraction_first_round = get_policy_distribution(
+        ConstantModel(1.0), 68000)
+
+    assert distribution == get_bet_percentage_distribution(68000, 100), \
+        "a constant bet fraction should match the bet percentage distribution"
+    assert bet_fraction_first_round == 1.0
+
+
+def test_get_policy_distribution_first_round():
+    _, bet_fraction_first_round = get_policy_distribution(BankrollModel(), 68000)
+
+    assert np.isclose(bet_fraction_first_round, 68000 / 204000)
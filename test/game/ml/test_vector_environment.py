@@ -0,0 +1,56 @@
+import numpy as np
+from src.game.ml.ml_environment import bankroll_to_reward
+from src.game.ml.vector_environment import TraitorRouletteVecEnv, bankrolls_to_rewards
+
+
+def test_bankrolls_to_rewards():
+    initial_bankroll = 68000
+    bankrolls = np.array([0, 34000, 68000, 102000, 204000])
+
+    rewards = bankrolls_to_rewards(bankrolls, initial_bankroll, initial_bankroll * 3)
+
+    for bankroll, reward in zip(bankrolls, rewards):
+        assert reward == bankroll_to_reward(
+            bankroll, initial_bankroll, initial_bankroll * 3), "reward should match the scalar reward"
+
+
+def test_reset():
+    env = TraitorRouletteVecEnv(68000, 4)
+
+    observations = env.reset()
+
+    assert observations.shape == (4, 2)
+    assert np.allclose(observations[:, 0], 1 / 4), "all games should be in round 1"
+    assert np.allclose(observations[:, 1], 1 / 3), "all games should have the initial bankroll"
+
+
+def test_step_auto_resets():
+    initial_bankroll = 68000
+    env = TraitorRouletteVecEnv(initial_bankroll, 16)
+    env.reset()
+
+    for _ in range(3):
+        observations, rewards, dones, infos = env.step(np.full(16, .01))
+
+    # betting the minimum the game always lasts for all three rounds
+    assert np.all(dones), "all games should have ended"
+    assert np.allclose(observations[:, 0], 1 / 4), "games should have been reset"
+    for reward, info in zip(rewards, infos):
+        assert info["terminal_observation"][0] == 1, "last observation should be after round 3"
+        assert reward == bankroll_to_reward(
+            info["final_bankroll"], initial_bankroll, initial_bankroll * 3)
+
+
+def test_seed():
+    first_env = TraitorRouletteVecEnv(68000, 8)
+    second_env = TraitorRouletteVecEnv(68000, 8)
+    first_env.seed(1)
+    second_env.seed(1)
+    first_env.reset()
+    second_env.reset()
+
+    for _ in range(6):
+        first_result = first_env.step(np.full(8, .5))
+        second_result = second_env.step(np.full(8, .5))
+        assert np.array_equal(first_result[0], second_result[0])
+        assert np.array_equal(first_result[1], second_result[1])
@@ -0,0 +1,93 @@
+import numpy as np
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.pocket import Pocket, PocketType
+from src.game.random_numbers import create_generator
+from src.game.roulette_wheels import RiggedWheel
+from src.game.traitor_roulette_game import TraitorRouletteGame
+
+
+def test_get_valid_bet_size():
+    initial_bankroll = 68000
+    bankrolls = np.arange(0, initial_bankroll * 3 + 1, 2000)
+    game = BatchTraitorRouletteGame(initial_bankroll, len(bankrolls))
+    game._bankrolls[:] = bankrolls
+
+    scalar_game = TraitorRouletteGame(initial_bankroll)
+    for bet_percentage in [0, 0.01, 1, 1.47, 2.94, 25, 50, 99.99, 100, 200]:
+        bet_sizes = game.get_valid_bet_size(bet_percentage)
+        for bankroll, bet_size in zip(bankrolls, bet_sizes):
+            scalar_game._bankroll = int(bankroll)
+            assert bet_size == scalar_game.get_valid_bet_size(bet_percentage), \
+                f"bet size for bankroll {bankroll} and {bet_percentage}% should match the scalar game"
+
+
+def test_play_matches_scalar_game():
+    initial_bankroll = 68000
+    bet_percentage = 60
+    pocket_sequences = [
+        [PocketType.TRAITOR, PocketType.TRAITOR, PocketType.RED],
+        [PocketType.RED, PocketType.BLACK, PocketType.GREEN],
+        [PocketType.BLACK, PocketType.BLACK, PocketType.BLACK],
+        [PocketType.GREEN, PocketType.GREEN, PocketType.TRAITOR],
+        [PocketType.TRAITOR, PocketType.RED, PocketType.TRAITOR],
+    ]
+
+    game = BatchTraitorRouletteGame(initial_bankroll, len(pocket_sequences))
+    predictions = np.full(len(pocket_sequences), PocketType.RED.value)
+    round = 0
+    while not game.have_all_games_ended():
+        pocket_types = np.array([sequence[round].value
+                                 for sequence in pocket_sequences])
+        game.play(game.get_valid_bet_size(bet_percentage),
+                  predictions, pocket_types)
+        round += 1
+
+    for i, sequence in enumerate(pocket_sequences):
+        wheel = RiggedWheel([Pocket(0, pocket_type)
+                             for pocket_type in sequence])
+        scalar_game = TraitorRouletteGame(initial_bankroll, wheel)
+        while not scalar_game.has_game_ended():
+            scalar_game.play(scalar_game.get_valid_bet_size(
+                bet_percentage), PocketType.RED)
+
+        assert game.bankrolls[i] == scalar_game.bankroll, \
+            f"final bankroll of game {i} should match the scalar game"
+        assert game.current_rounds[i] == scalar_game.current_round, \
+            f"final round of game {i} should match the scalar game"
+
+
+def test_play_ignores_ended_games():
+    initial_bankroll = 68000
+    game = BatchTraitorRouletteGame(initial_bankroll, 2)
+    game._bankrolls[0] = 0
+
+    pockets, winnings = game.play(2000, PocketType.RED.value,
+                                  np.array([PocketType.RED.value] * 2))
+
+    assert pockets[0] == -1, "ended game should not be spun"
+    assert winnings[0] == 0, "ended game should not win"
+    assert game.bankrolls[0] == 0, "ended game should keep its bankroll"
+    assert game.current_rounds[0] == 1, "ended game should keep its round"
+    assert game.bankrolls[1] == initial_bankroll + 2000, "running game should win"
+
+
+def test_play_caps_winnings():
+    initial_bankroll = 68000
+    game = BatchTraitorRouletteGame(initial_bankroll, 1)
+    game._bankrolls[0] = initial_bankroll * 3 - 2000
+
+    _, winnings = game.play(2000, PocketType.RED.value,
+                            np.array([PocketType.TRAITOR.value]))
+
+    assert winnings[0] == 4000, "winnings should be capped"
+    assert game.bankrolls[0] == initial_bankroll * 3, "bankroll should be capped"
+
+
+def test_set_rng_replays_seeded_games():
+    game = BatchTraitorRouletteGame(68000, 64, create_generator(42))
+    pockets, _ = game.play(game.get_valid_bet_size(10), PocketType.RED.value)
+
+    game.reset()
+    game.set_rng(create_generator(42))
+    assert np.array_equal(game.play(game.get_valid_bet_size(10), PocketType.RED.value)[0],
+                          pockets), "the same seed should spin the same pockets"
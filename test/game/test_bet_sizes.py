@@ -0,0 +1,27 @@
+import numpy as np
+from src.game.bet_sizes import create_bet_size_table
+from src.game.rules import TraitorRouletteRules
+from src.game.traitor_roulette_game import TraitorRouletteGame
+
+
+def test_create_bet_size_table():
+    initial_bankroll = 68000
+    bet_percentages = np.array([0, 0.01, 1, 1.47, 2.94, 25, 50, 99.99, 100, 200])
+    table = create_bet_size_table(initial_bankroll, bet_percentages)
+
+    assert table.shape == (len(bet_percentages), 103)
+    game = TraitorRouletteGame(initial_bankroll)
+    for i, bet_percentage in enumerate(bet_percentages):
+        for units in range(table.shape[1]):
+            game._bankroll = units * 2000
+            assert table[i, units] == game.get_valid_bet_size(bet_percentage), \
+                f"bet size for {units} units and {bet_percentage}% should match the game"
+
+
+def test_create_bet_size_table_with_rules():
+    rules = TraitorRouletteRules(max_multiplier=2, bet_size_increments=500)
+    table = create_bet_size_table(3000, [10, 90], rules)
+
+    assert table.shape == (2, 13)
+    assert table[0].tolist() == [0] + [500] * 12, "bets should not be 0"
+    assert table[1, 12] == 3000, "bets should be capped at the initial bankroll"
@@ -0,0 +1,66 @@
+from fractions import Fraction
+import numpy as np
+from src.game.exact_evaluation import get_bet_percentage_distribution, get_bet_percentage_surface, \
+    get_mean, get_pocket_probabilities
+from src.game.pocket import PocketType
+from src.game.rules import TraitorRouletteRules
+
+
+def test_get_pocket_probabilities():
+    probabilities = {pocket.type: probability for pocket, probability
+                     in get_pocket_probabilities()}
+
+    assert probabilities[PocketType.GREEN] == Fraction(1, 37)
+    assert probabilities[PocketType.RED] == Fraction(12, 37)
+    assert probabilities[PocketType.BLACK] == Fraction(12, 37)
+    assert probabilities[PocketType.TRAITOR] == Fraction(12, 37)
+
+
+def test_get_pocket_probabilities_of_rules():
+    rules = TraitorRouletteRules(numbers_count=12, traitor_divisor=4)
+    probabilities = {pocket.type: probability for pocket, probability
+                     in get_pocket_probabilities(rules)}
+
+    assert probabilities[PocketType.GREEN] == Fraction(1, 13)
+    assert probabilities[PocketType.TRAITOR] == Fraction(3, 13)
+    assert sum(probabilities.values()) == 1
+
+
+def test_get_bet_percentage_distribution():
+    initial_bankroll = 68000
+    distribution = get_bet_percentage_distribution(initial_bankroll, 100)
+
+    assert sum(distribution.values()) == 1, "probabilities should sum up to 1"
+    assert min(distribution) >= 0
+    assert max(distribution) == initial_bankroll * 3
+
+    win = Fraction(12, 37)
+    loss = Fraction(13, 37)
+    # lose everything in the first round or win, lose and lose again
+    assert distribution[0] == loss + win * loss * loss, "bust probability should match"
+
+
+def test_get_mean_of_minimal_bets():
+    initial_bankroll = 68000
+    # 2000 are always bet, each round has the same expected value
+    distribution = get_bet_percentage_distribution(initial_bankroll, 0.01)
+    expected_round_winnings = -2000 + Fraction(12, 37) * 3 * 2000 + \
+        Fraction(12, 37) * 2 * 2000
+
+    assert get_mean(distribution) == initial_bankroll + 3 * expected_round_winnings
+
+
+def test_get_bet_percentage_surface():
+    initial_bankrolls = [2000, 10000, 68000]
+    bet_percentages = np.array([0.01, 1.47, 2.94, 50, 98.53, 100])
+    means, minimums, maximums = get_bet_percentage_surface(
+        initial_bankrolls, bet_percentages)
+
+    for i, initial_bankroll in enumerate(initial_bankrolls):
+        for j, bet_percentage in enumerate(bet_percentages):
+            distribution = get_bet_percentage_distribution(
+                initial_bankroll, bet_percentage)
+            assert np.isclose(means[i, j], float(get_mean(distribution))), \
+                f"mean for {initial_bankroll} and {bet_percentage}% should match the distribution"
+            assert minimums[i, j] == min(distribution)
+            assert maximums[i, j] == max(distribution)
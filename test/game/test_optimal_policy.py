@@ -0,0 +1,45 @@
+import os
+import tempfile
+import numpy as np
+from src.game.exact_evaluation import get_final_bankroll_distribution, get_mean
+from src.game.optimal_policy import OptimalPolicy, solve_optimal_policy
+
+
+def test_solve_optimal_policy():
+    initial_bankroll = 68000
+    policy = solve_optimal_policy(initial_bankroll)
+
+    # close to the cap betting more than the missing amount is not worth it
+    assert policy.get_bet_size(3, 2000) == 2000
+    assert policy.get_bet_size(3, initial_bankroll * 3 - 2000) == 2000
+
+    distribution = get_final_bankroll_distribution(
+        initial_bankroll,
+        lambda game: policy.get_bet_size(game.current_round, game.bankroll))
+    assert np.isclose(float(get_mean(distribution)), policy.expected_value), \
+        "expected value of the policy should match its exact evaluation"
+
+
+def test_optimal_policy_beats_static_bets():
+    initial_bankroll = 68000
+    policy = solve_optimal_policy(initial_bankroll)
+
+    for bet_percentage in [1, 25, 50, 75, 100]:
+        distribution = get_final_bankroll_distribution(
+            initial_bankroll,
+            lambda game: game.get_valid_bet_size(bet_percentage))
+        assert float(get_mean(distribution)) <= policy.expected_value, \
+            f"static bet of {bet_percentage}% should not beat the optimal policy"
+
+
+def test_save_and_load():
+    policy = solve_optimal_policy(10000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "policy.npz")
+        policy.save(file_path)
+        loaded = OptimalPolicy.load(file_path)
+
+    assert loaded.initial_bankroll == policy.initial_bankroll
+    assert np.array_equal(loaded.bets, policy.bets)
+    assert np.array_equal(loaded.values, policy.values)
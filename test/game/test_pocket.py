@@ -0,0 +1,28 @@
+import copy
+import pickle
+import pytest
+from src.game.pocket import Pocket, PocketType
+
+
+def test_pockets_are_interned():
+    assert Pocket(3, PocketType.TRAITOR) is Pocket(3, PocketType.TRAITOR), \
+        "same pocket should be the same instance"
+    assert Pocket(3, PocketType.TRAITOR) is not Pocket(3, PocketType.RED)
+
+
+def test_pockets_are_immutable():
+    pocket = Pocket(1, PocketType.RED)
+
+    with pytest.raises(AttributeError):
+        pocket._number = 2
+    with pytest.raises(AttributeError):
+        pocket.other = 2
+
+    assert pocket.number == 1
+
+
+def test_copy_and_pickle():
+    pocket = Pocket(2, PocketType.BLACK)
+
+    assert copy.deepcopy(pocket) is pocket
+    assert pickle.loads(pickle.dumps(pocket)) is pocket
@@ -0,0 +1,26 @@
+import numpy as np
+from src.game.random_numbers import RandomIntegers, create_generator
+
+
+def test_create_generator():
+    assert isinstance(create_generator(0).bit_generator, np.random.Philox)
+    assert create_generator(0).integers(1 << 30) == create_generator(0).integers(1 << 30)
+    assert not np.array_equal(create_generator(0).random(8), create_generator(1).random(8))
+
+
+def test_random_integers_across_chunks():
+    integers = RandomIntegers(create_generator(0), 37, chunk_size=16)
+
+    values = [integers.next() for _ in range(100)]
+
+    rng = create_generator(0)
+    expected = np.concatenate([rng.integers(0, 37, size=16) for _ in range(7)])
+    assert values == expected[:100].tolist(), \
+        "values should be drawn from the generator in chunks and in order"
+
+
+def test_random_integers_without_generator():
+    integers = RandomIntegers(None, 2)
+
+    assert integers.next() in [0, 1]
+    assert isinstance(integers.rng, np.random.Generator)
@@ -1,4 +1,6 @@
+import numpy as np
 from src.game.pocket import Pocket, PocketType
+from src.game.random_numbers import create_generator
 from src.game.roulette_wheels import RiggedWheel, RouletteWheel, TraitorRouletteWheel
 
 
@@ -37,6 +39,17 @@ def test_spin():
                                PocketType.TRAITOR], "Spin should return a pocket with a valid type"
 
 
+def test_seeded_spins_are_reproducible():
+    wheel = TraitorRouletteWheel(create_generator(42))
+    spins = [wheel.spin() for _ in range(10000)]
+
+    wheel.set_rng(create_generator(42))
+    assert [wheel.spin() for _ in range(10000)] == spins, \
+        "the same seed should spin the same pockets"
+    assert TraitorRouletteWheel(create_generator(43)).spin_many(100)[0].tolist() != \
+        [pocket.number for pocket in spins[:100]]
+
+
 def count_pocket_types(wheel: RouletteWheel, pocket_type: PocketType):
     result = 0
     for pocket in wheel:
@@ -50,3 +63,27 @@ def test_rigged_wheel_spin():
     assert wheel.spin() == Pocket(1, PocketType.RED)
     assert wheel.spin() == Pocket(2, PocketType.BLACK)
     assert wheel.spin() == Pocket(1, PocketType.RED)
+
+
+def test_spin_many():
+    wheel = TraitorRouletteWheel()
+
+    numbers, types = wheel.spin_many(1024, np.random.default_rng(0))
+
+    assert len(numbers) == 1024 and len(types) == 1024
+    assert numbers.min() >= 0 and numbers.max() <= 36
+    for number, type in zip(numbers, types):
+        assert wheel._wheel[number].type.value == type, \
+            "type should match the pocket number"
+
+
+def test_rigged_wheel_spin_many():
+    wheel = RiggedWheel([Pocket(1, PocketType.RED), Pocket(2, PocketType.BLACK)])
+
+    wheel.spin()
+    numbers, types = wheel.spin_many(3)
+
+    assert numbers.tolist() == [2, 1, 2]
+    assert types.tolist() == [PocketType.BLACK.value, PocketType.RED.value,
+                              PocketType.BLACK.value]
+    assert wheel.spin() == Pocket(1, PocketType.RED)
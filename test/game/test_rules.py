@@ -0,0 +1,71 @@
+import dataclasses
+import numpy as np
+import pytest
+from src.game.batch_traitor_roulette_game import BatchTraitorRouletteGame
+from src.game.pocket import Pocket, PocketType
+from src.game.roulette_wheels import RiggedWheel, TraitorRouletteWheel
+from src.game.rules import DEFAULT_RULES, TraitorRouletteRules
+from src.game.traitor_roulette_game import TraitorRouletteGame
+
+
+def test_default_rules():
+    assert len(DEFAULT_RULES.pockets) == 37
+    assert DEFAULT_RULES.get_max_bankroll(68000) == 204000
+    assert DEFAULT_RULES.get_payout(PocketType.RED, PocketType.RED) == 2
+    assert DEFAULT_RULES.get_payout(PocketType.RED, PocketType.BLACK) == 0
+    assert DEFAULT_RULES.get_payout(PocketType.BLACK, PocketType.TRAITOR) == 3
+    assert DEFAULT_RULES.get_payout(PocketType.BLACK, PocketType.GREEN) == 0
+
+
+def test_rules_are_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        DEFAULT_RULES.max_rounds = 4
+    with pytest.raises(ValueError):
+        DEFAULT_RULES.payouts[1, 1] = 4
+
+    assert TraitorRouletteRules() == DEFAULT_RULES
+    assert TraitorRouletteRules(max_rounds=4) != DEFAULT_RULES
+
+
+def test_wheel_of_rules():
+    rules = TraitorRouletteRules(numbers_count=12, traitor_divisor=4)
+    wheel = TraitorRouletteWheel(rules=rules)
+
+    types = [pocket.type for pocket in wheel._wheel]
+    assert len(types) == 13
+    assert types.count(PocketType.TRAITOR) == 3
+    numbers, _ = wheel.spin_many(1000, np.random.default_rng(0))
+    assert numbers.max() <= 12, "only pockets of the rules should be spun"
+
+
+def test_game_with_rules():
+    rules = TraitorRouletteRules(max_rounds=2, max_multiplier=2,
+                                 bet_size_increments=1000, traitor_payout=4)
+    wheel = RiggedWheel([Pocket(3, PocketType.TRAITOR)])
+    game = TraitorRouletteGame(10000, wheel, rules)
+
+    assert game.get_valid_bet_size(14) == 1000
+    _, winnings = game.play(2000, PocketType.RED)
+    assert winnings == 8000
+    assert game.bankroll == 16000
+    _, winnings = game.play(5000, PocketType.RED)
+    assert winnings == 9000, "winnings should be capped at twice the initial bankroll"
+    assert game.has_game_ended()
+
+
+def test_batch_game_matches_game_with_rules():
+    rules = TraitorRouletteRules(max_rounds=5, color_payout=3)
+    pocket_types = [PocketType.RED, PocketType.TRAITOR, PocketType.BLACK,
+                    PocketType.GREEN, PocketType.RED]
+    game = TraitorRouletteGame(
+        40000, RiggedWheel([Pocket(0, pocket_type) for pocket_type in pocket_types]),
+        rules)
+    batch_game = BatchTraitorRouletteGame(40000, 1, rules=rules)
+
+    for pocket_type in pocket_types:
+        bet = game.get_valid_bet_size(30)
+        game.play(bet, PocketType.RED)
+        batch_game.play(bet, PocketType.RED.value, np.array([pocket_type.value]))
+
+        assert batch_game.bankrolls[0] == game.bankroll
+    assert game.has_game_ended() and batch_game.have_all_games_ended()
@@ -1,7 +1,8 @@
 
 
 import random
-from src.game.pocket import PocketType
+from src.game.pocket import Pocket, PocketType
+from src.game.roulette_wheels import RiggedWheel
 from src.game.traitor_roulette_game import MAX_ROUNDS, TraitorRouletteGame
 
 
@@ -64,6 +65,16 @@ def test_get_valid_bet_size():
     assert game.get_valid_bet_size(50) == 34000, "bet size should be 34000"
 
 
+def test_play_unchecked_matches_play():
+    pockets = [Pocket(3, PocketType.TRAITOR), Pocket(2, PocketType.BLACK),
+               Pocket(1, PocketType.RED)]
+    game = TraitorRouletteGame(68000, RiggedWheel(pockets))
+    unchecked_game = TraitorRouletteGame(68000, RiggedWheel(pockets))
 
-
+    while not game.has_game_ended():
+        bet_size = game.get_valid_bet_size(70)
+        assert unchecked_game.play_unchecked(bet_size, PocketType.RED) == \
+            game.play(bet_size, PocketType.RED)
+        assert unchecked_game.bankroll == game.bankroll
+        assert unchecked_game.current_round == game.current_round
 
@@ -0,0 +1,130 @@
+import math
+import os
+import numpy as np
+import bruteforce
+from bruteforce import Run
+
+
+def assert_statistics(run: Run, bankrolls: np.ndarray):
+    assert run.count == len(bankrolls)
+    assert math.isclose(run.avg(), np.mean(bankrolls))
+    assert math.isclose(run.variance(), np.var(bankrolls, ddof=1))
+    assert math.isclose(run.std_error(),
+                        np.std(bankrolls, ddof=1) / math.sqrt(len(bankrolls)))
+    assert run.min() == np.min(bankrolls)
+    assert run.max() == np.max(bankrolls)
+
+
+def test_run_add_final_bankroll():
+    bankrolls = np.random.default_rng(0).integers(0, 204001, size=1000)
+    run = Run(1)
+    for bankroll in bankrolls:
+        run.add_final_bankroll(int(bankroll))
+
+    assert_statistics(run, bankrolls)
+
+
+def test_run_merge():
+    bankrolls = np.random.default_rng(0).integers(0, 204001, size=1000)
+    run = Run(1)
+    for batch in np.array_split(bankrolls, [1, 10, 10, 400]):
+        shard_run = Run(1)
+        shard_run.add_final_bankrolls(batch)
+        run.merge(shard_run)
+
+    assert_statistics(run, bankrolls)
+
+    run.merge(Run(1))
+    run.add_final_bankrolls(np.array([], dtype=np.int64))
+    assert_statistics(run, bankrolls)
+
+    empty_run = Run(1)
+    empty_run.merge(run)
+    assert_statistics(empty_run, bankrolls)
+
+
+def test_run_without_games():
+    run = Run(1)
+
+    assert run.count == 0
+    assert run.variance() == 0
+    assert run.std_error() == 0
+
+
+def play_runs(games_counts: list, batch: bool, workers: int) -> np.ndarray:
+    runs = [Run(.01 * i) for i in range(1, len(games_counts) + 1)]
+    bruteforce.play_runs(68000, runs, .01, games_counts, batch, workers, 0)
+    return np.array([run.to_result() for run in runs])
+
+
+def test_play_runs_does_not_depend_on_workers():
+    # every 100th bet percentage keeps the test fast
+    games_counts = [50 if i % 100 == 0 else 0 for i in range(1, 10001)]
+    for batch in [False, True]:
+        results = play_runs(games_counts, batch, workers=1)
+
+        assert np.array_equal(play_runs(games_counts, batch, workers=3), results,
+                              equal_nan=True), \
+            f"results with batch {batch} should not depend on the number of workers"
+
+
+def test_play_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(bruteforce, "get_output_dir_path", lambda: str(tmp_path))
+    results = bruteforce.play(68000, 10000, seed=0, checkpoint=True)
+    checkpoint_path = bruteforce.get_checkpoint_path(68000, .01, 0)
+    assert os.path.exists(checkpoint_path)
+
+    played_shards = []
+    play_shard = bruteforce.play_shard
+
+    def count_played_shards(*args):
+        played_shards.append(args)
+        return play_shard(*args)
+
+    monkeypatch.setattr(bruteforce, "play_shard", count_played_shards)
+    assert np.array_equal(bruteforce.play(68000, 10000, seed=0, checkpoint=True),
+                          results), "resuming a finished run should not change it"
+    assert played_shards == [], "resuming a finished run should not play any games"
+
+    bruteforce.play(68000, 20000, seed=0, checkpoint=True)
+    runs = [Run(.01 * i) for i in range(1, 10001)]
+    bruteforce.load_checkpoint(checkpoint_path, runs)
+    assert all(run.count == 2 for run in runs), \
+        "extending a run should only play the missing games"
+
+
+def test_play_common_random_numbers():
+    results, differences = bruteforce.play_common_random_numbers(68000, 50000, 50, 0)
+
+    reference = np.flatnonzero(np.isclose(differences[:, 0], 50))
+    assert len(reference) == 1
+    assert differences[reference[0], 1] == 0, \
+        "the reference percentage should not differ from itself"
+    assert differences[reference[0], 2] == 0
+
+    other_results, other_differences = bruteforce.play_common_random_numbers(
+        68000, 50000, 50, 0)
+    assert np.array_equal(other_results, results), "the seed should reproduce the results"
+    assert np.array_equal(other_differences, differences)
+
+
+def test_get_halving_rounds():
+    assert bruteforce.get_halving_rounds(2) == 1
+    assert bruteforce.get_halving_rounds(3) == 2
+    assert bruteforce.get_halving_rounds(10000) == 14
+
+
+def test_play_adaptive_spends_the_budget(monkeypatch):
+    games_count = 1 << 20
+    played_games_counts = []
+
+    # only the games scheduled per halving round are counted, none are played
+    def count_played_games(bankroll, runs, step_size, games_counts, *args):
+        played_games_counts.append(sum(games_counts))
+
+    monkeypatch.setattr(bruteforce, "play_runs", count_played_games)
+    bruteforce.play_adaptive(68000, games_count, seed=0)
+
+    assert len(played_games_counts) == bruteforce.get_halving_rounds(10000)
+    assert abs(sum(played_games_counts) - games_count) < games_count * .01, \
+        "the games played should be close to the games count"
@@ -0,0 +1,20 @@
+from stable_baselines3 import SAC
+from machine_learning_training import BetPercentageCallback, TimingCallback
+from src.game.ml.ml_environment import create_environment
+
+
+def test_timing_callback():
+    total_timesteps = 300
+    model = SAC("MlpPolicy", create_environment(68000), seed=0,
+                learning_starts=100, batch_size=32)
+    callback = BetPercentageCallback()
+    timing_callback = TimingCallback(callback)
+
+    model.learn(total_timesteps=total_timesteps, callback=timing_callback)
+    metrics = timing_callback.get_metrics()
+
+    assert metrics["env_steps"] == total_timesteps
+    assert metrics["gradient_updates"] > 0
+    assert metrics["gradient_updates"] == model._n_updates
+    assert len(callback.losses) > 0, "the wrapped callback should record losses"
+    assert callback.n_calls == total_timesteps, "steps should be forwarded"
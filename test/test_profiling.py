@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+import src.profiling
+from src.profiling import SamplingProfiler, map_profiled, profile
+
+
+def busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_wait_in_worker(seconds: float) -> float:
+    busy_wait(seconds)
+    return seconds
+
+
+def test_profile_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.profiling, "generate_filepath",
+                        lambda base_filename: os.path.join(tmp_path, base_filename))
+
+    with profile("test", False):
+        busy_wait(.01)
+
+    assert os.listdir(tmp_path) == [], "no files should be written"
+
+
+def test_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.profiling, "generate_filepath",
+                        lambda base_filename: os.path.join(tmp_path, base_filename))
+
+    with profile("test", True, top=5):
+        busy_wait(.01)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "test_profile.pstats", "test_profile.txt"]
+    with open(os.path.join(tmp_path, "test_profile.txt")) as f:
+        assert "busy_wait" in f.read()
+
+
+def test_sampling_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.profiling, "generate_filepath",
+                        lambda base_filename: os.path.join(tmp_path, base_filename))
+
+    with profile("test", True, interval=.001):
+        busy_wait(.2)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "test_profile.folded", "test_profile.txt"]
+    with open(os.path.join(tmp_path, "test_profile.txt")) as f:
+        assert "busy_wait" in f.read()
+
+
+def test_sampling_profiler_counts():
+    profiler = SamplingProfiler(.001)
+
+    profiler.start()
+    busy_wait(.2)
+    profiler.stop()
+
+    assert profiler.samples > 0
+    assert sum(profiler.self_counts.values()) == profiler.samples
+    assert sum(profiler.stacks.values()) == profiler.samples
+
+
+def test_map_profiled_disabled():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(map_profiled(executor, busy_wait_in_worker, [.01, .02])) == [.01, .02]
+
+
+def test_profile_includes_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.profiling, "generate_filepath",
+                        lambda base_filename: os.path.join(tmp_path, base_filename))
+
+    for interval in [None, .001]:
+        with profile("test", True, interval=interval):
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                assert list(map_profiled(executor, busy_wait_in_worker, [.1, .2])) == [.1, .2]
+
+        with open(os.path.join(tmp_path, "test_profile.txt")) as f:
+            assert "(busy_wait)" in f.read(), \
+                "calls in the workers should be profiled"